@@ -18,153 +18,2105 @@ To print dramatically whenever a function runs:
         print("ALL output will display dramatically.")
         print("Even things printed by other functions we call.")
 
+To dramatically print text chunks as a generator produces them:
+
+    dramatic.stream(chunks)
+
 To print dramatically for the rest of your Python process:
 
-    dramatic.start()
-"""
+    dramatic.start()
+
+To broadcast all output dramatically to viewers connected over the network:
+
+    with dramatic.broadcast(("0.0.0.0", 8075)):
+        print("Connect with: nc <host> 8075")
+
+To log dramatically (from a background thread) for the rest of your process:
+
+    dramatic.start_logging()
+
+To stream text responses from a web app dramatically:
+
+    app = dramatic.DramaticASGIMiddleware(app)  # or DramaticWSGIMiddleware
+
+To simulate a slow network link with a socket, pipe, or binary file:
+
+    sock = dramatic.throttle(sock, bytes_per_second=10_000, latency=0.1)
+"""
+
+from argparse import SUPPRESS, ArgumentParser, ArgumentTypeError
+from array import array
+import atexit
+import code
+from codecs import getincrementaldecoder
+from collections import OrderedDict, deque, namedtuple
+from contextlib import ContextDecorator, ExitStack, contextmanager, suppress
+from copy import copy
+from fractions import Fraction
+from functools import cache
+from importlib.util import cache_from_source, find_spec
+from io import TextIOWrapper
+import logging
+import os
+from pathlib import Path
+from queue import Full, Queue
+import re
+import runpy
+import select
+from site import getsitepackages, getusersitepackages
+import struct
+import sys
+from textwrap import dedent
+from threading import Lock, Thread
+from time import perf_counter, sleep
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
+__version__ = "0.5.0"
+__all__ = []  # Disable "from dramatic import *"
+_DEFAULT_SPEED = 75
+_DEFAULT_LOG_QUEUE_SIZE = 1000
+_DEFAULT_HOST = "127.0.0.1"
+_DEFAULT_PORT = 8075
+_DEFAULT_MAX_BACKLOG = 10_000
+_DEFAULT_FRAME_RATE = 60
+_DEFAULT_REPEAT_WINDOW = 100
+_PLAN_CACHE_SIZE = 256
+_PLAN_CACHE_MAX_LENGTH = 4096  # Longer strings are planned but not cached
+_PLAN_CACHE_MAX_MEMORY = 2 * 1024 * 1024  # Estimated bytes
+_RING_SIZE = 64 * 1024
+_RING_COUNT = struct.Struct("Q")
+_RING_CAPACITY, _RING_WRITTEN, _RING_READ, _RING_CLOSED = 0, 8, 16, 24
+_RING_HEADER_SIZE = 32
+_RECORD = struct.Struct("<BI")  # Stream number and length of each write
+_RECORD_MAX_SIZE = 4096
+_RENDER_POLL_INTERVAL = 0.002
+_MAX_WRITE_SIZE = 1024  # Characters that always fit in an empty write buffer
+_LINE_BREAK_RE = re.compile(r"(\r(?!\n)|\n)")
+_LINE_RE = re.compile(r"[^\n]*\n|[^\n]+")
+_DIGITS_RE = re.compile(r"\d+")
+_ESCAPE_RE = re.compile(
+    r"\x1b\[[0-?]*[ -/]*[@-~]"  # Control sequences (colors, cursor movement)
+    r"|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)"  # Operating system commands
+    r"|\x1b[@-Z\\-_]"  # Other two character escape sequences
+)
+_SGR_RE = re.compile(r"\x1b\[[0-9;:]*m")  # Colors and other text styles
+_CALIBRATION_TEXT = ("=" * 79 + "\r") * 50
+
+# Written to _dramatic.pth by --max-drama. The site module runs this line at
+# every interpreter startup, so it only imports _dramatic once the cheap
+# checks (a terminal, no DRAMATIC_DISABLE, an allowed program) have passed.
+# sys.argv[0] is just "-m" for "python -m module" while .pth files run, so
+# the module name is found in sys.orig_argv instead (on Python 3.10+).
+_MAX_DRAMA_HOOK = (
+    "import os, sys; "
+    "argv = getattr(sys, 'orig_argv', ()); "
+    "program = argv[argv.index('-m') + 1] "
+    "if sys.argv[0] == '-m' and '-m' in argv[:-1] "
+    "else os.path.basename(sys.argv[0]); "
+    "os.isatty(1) "
+    "and not os.environ.get('DRAMATIC_DISABLE') "
+    "and (not os.environ.get('DRAMATIC_PROGRAMS') "
+    "or program in os.environ['DRAMATIC_PROGRAMS'].split(',')) "
+    "and __import__('_dramatic')._max_drama_start()\n"
+)
+_VERSION_RE = re.compile(r'^__version__ = "([^"]+)"', re.MULTILINE)
+
+
+def _throughput_path():
+    """Return the path that terminal calibration results are saved to."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "dramatic" / "throughput"
+
+
+@cache
+def _terminal_speed():
+    """Return the calibrated terminal speed (or None if not calibrated)."""
+    with suppress(OSError, ValueError):
+        return int(_throughput_path().read_text())
+    return None
+
+
+def _capped_speed(speed):
+    """Return the given speed, capped to the calibrated terminal speed."""
+    if speed is None:
+        speed = _DEFAULT_SPEED
+    max_speed = _terminal_speed()
+    if max_speed and speed > max_speed:
+        return max_speed
+    return speed
+
+
+def _overwrites(frame, text):
+    """
+    Return True if writing frame (after a carriage return) hides text.
+
+    Colors in frame don't take up any space.  Text with escape sequences
+    is never considered hidden, since they may change more than what's
+    shown on this line (and so can frames with other escape sequences).
+    """
+    if "\x1b" in text:
+        return False
+    frame = _SGR_RE.sub("", frame)
+    return "\x1b" not in frame and len(frame) >= len(text)
+
+
+def _wait_writable(file):
+    """Wait until a non-blocking file is ready to be written to."""
+    poller = select.poll()
+    poller.register(file.fileno(), select.POLLOUT)
+    poller.poll()
+
+
+def _retry_blocking(function, file):
+    """Call function, waiting for file (and retrying) if it would block."""
+    while True:
+        try:
+            return function()
+        except BlockingIOError:
+            _wait_writable(file)
+
+
+class _RepeatDetector:
+    """
+    Remember recent lines to spot repeated (or nearly repeated) lines.
+
+    Lines are compared with their digits masked, so counters and
+    timestamps don't make otherwise identical lines look different.
+    Only hashes of the last window lines are kept.
+
+    The mode is "fast" (write repeated lines all at once) or "collapse"
+    (replace consecutive repeats with a "(repeated N times)" marker).
+    """
+
+    def __init__(self, mode, window=None):
+        if window is None:
+            window = _DEFAULT_REPEAT_WINDOW
+        self.mode = mode
+        self.recent = deque(maxlen=max(window, 1))
+        self.counts = {}
+        self.run = 0
+
+    def seen(self, line):
+        """Record a line, returning True if it repeats a recent line."""
+        key = hash(_DIGITS_RE.sub("0", line))
+        repeated = key in self.counts
+        self.run = self.run + 1 if self.recent and self.recent[-1] == key else 1
+        if len(self.recent) == self.recent.maxlen:
+            oldest = self.recent.popleft()
+            self.counts[oldest] -= 1
+            if not self.counts[oldest]:
+                del self.counts[oldest]
+        self.recent.append(key)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        return repeated
+
+
+def _write_plan(string, frame_size):
+    """
+    Return (ends, counts) arrays describing how to write string dramatically.
+
+    Each segment of string ends at the matching offset in ends, holds
+    count visible characters (frame_size at most), and is followed by a
+    pause for those characters.  Escape sequences (like colors) are
+    written along with the character after them, so they don't get a
+    pause of their own.
+    """
+    if "\x1b" in string:
+        escapes = {i for m in _ESCAPE_RE.finditer(string) for i in range(*m.span())}
+        visible = [i for i in range(len(string)) if i not in escapes]
+    else:
+        visible = range(len(string))
+    ends, counts = array("I"), array("I")
+    start = 0
+    for first in range(0, len(visible), frame_size):
+        frame = visible[first : first + frame_size]
+        start = frame[-1] + 1
+        ends.append(start)
+        counts.append(len(frame))
+    if start < len(string):
+        ends.append(len(string))  # Trailing escape sequences
+        counts.append(0)
+    return ends, counts
+
+
+_CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "hit_rate", "maxsize", "currsize", "memory"]
+)
+
+
+class _PlanCache:
+    """
+    Least recently used cache of write plans for repeated strings.
+
+    Prompts, banners, and status lines are often written over and over,
+    so their plans are kept (keyed by the string and frame size) rather
+    than worked out again each time.  Plans only hold segment offsets,
+    and the memory counter estimates how many bytes the cached strings
+    and plans take up.  Least recently used plans are dropped once there
+    are more than maxsize plans or they take up more than maxmemory.
+    """
+
+    def __init__(self, maxsize=_PLAN_CACHE_SIZE, maxmemory=_PLAN_CACHE_MAX_MEMORY):
+        self.maxsize = maxsize
+        self.maxmemory = maxmemory
+        self.plans = OrderedDict()
+        self.hits = self.misses = self.memory = 0
+        self.lock = Lock()
+
+    def get(self, string, frame_size):
+        """Return the plan for writing string (from the cache if possible)."""
+        if len(string) > _PLAN_CACHE_MAX_LENGTH:
+            return _write_plan(string, frame_size)
+        key = (string, frame_size)
+        with self.lock:
+            plan = self.plans.get(key)
+            if plan is not None:
+                self.hits += 1
+                self.plans.move_to_end(key)
+                return plan
+            self.misses += 1
+        plan = _write_plan(string, frame_size)
+        with self.lock:
+            if key not in self.plans:
+                self.plans[key] = plan
+                self.memory += _plan_memory(key, plan)
+            while len(self.plans) > self.maxsize or self.memory > self.maxmemory:
+                self.memory -= _plan_memory(*self.plans.popitem(last=False))
+        return plan
+
+    def info(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return _CacheInfo(
+            self.hits, self.misses, hit_rate, self.maxsize, len(self.plans), self.memory
+        )
+
+
+def _plan_memory(key, plan):
+    """Estimate the bytes used by a cached plan (and its key)."""
+    return sum(map(sys.getsizeof, (key, key[0], plan, *plan)))
+
+
+_plans = _PlanCache()
+
+
+def cache_info():
+    """
+    Return statistics about the cache of write plans for repeated text.
+
+    The result has hits, misses, hit_rate, maxsize, currsize (number of
+    cached plans), and memory (estimated bytes used) attributes.
+    """
+    return _plans.info()
+
+
+def _frame_size(speed, frame_rate):
+    """Return how many characters are due during each frame."""
+    if frame_rate <= 0:
+        message = f"frame_rate must be positive, not {frame_rate!r}"
+        raise ValueError(message)
+    return max(1, int(speed / frame_rate))
+
+
+def _positive_fraction(value):
+    """Parse a positive number from the command-line."""
+    number = Fraction(value)
+    if number <= 0:
+        message = f"must be a positive number: {value!r}"
+        raise ArgumentTypeError(message)
+    return number
+
+
+# The dramatic stream (or binary writer) that last wrote to a terminal
+_last_writer = None
+
+
+def _shares_terminal_with_plain_stream(writer):
+    """Return True if a non-dramatic sys.stdout or sys.stderr shares writer's file."""
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, (_DramaticWriter, _RendererStream)):
+            continue
+        with suppress(AttributeError, OSError, ValueError):
+            if os.path.samestat(os.fstat(stream.fileno()), os.fstat(writer.fileno())):
+                return True
+    return False
+
+
+class _DramaticWriter:
+    """
+    Dramatic writing logic shared by dramatic text streams.
+
+    Classes using this provide _write_raw and _flush_raw methods (which
+    write and flush text without any drama) as well as isatty and fileno.
+    """
+
+    __slots__ = ()
+
+    def _setup(
+        self,
+        speed,
+        drain,
+        repeated=None,
+        repeat_window=None,
+        frame_rate=None,
+        tee=None,
+    ):
+        self.tee = tee
+        self.no_sleep_until = perf_counter()
+        self.speed = _capped_speed(speed)
+        self.drain = drain and termios is not None
+        self.frame_size = 1
+        if frame_rate is not None:
+            self.frame_size = _frame_size(self.speed, frame_rate)
+        self._redrawing = self._line_dirty = False
+        self._repeats = None
+        if repeated is not None:
+            self._repeats = _RepeatDetector(repeated, repeat_window)
+        self._pending = ""
+
+    def write(self, string):
+        """
+        Write dramatically, but only if this is a terminal device.
+
+        If Ctrl-C is pressed, the remaining text will print immediately.
+
+        Lines redrawn with carriage returns (like progress bars) are only
+        dramatic the first time: redrawn frames are written all at once.
+
+        If there's a tee file, the text is written (and flushed) to it
+        right away, before any drama.
+        """
+        if self.tee is not None:
+            self.tee.write(string)
+            self.tee.flush()
+        if not self.isatty():
+            self._write_raw(string)
+        elif "\r" in string or self._redrawing:
+            self._write_pending()
+            self._write_frames(string)
+            if self._repeats is not None:
+                self._repeats.run = 0
+        elif self._repeats is not None:
+            self._write_lines(string)
+        elif string:
+            self._write_dramatically(string)
+            self._line_dirty = string[-1] != "\n"
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self._write_pending()
+        _retry_blocking(self._flush_raw, self)
+
+    def _write_now(self, text):
+        """
+        Write and flush text without any drama.
+
+        If the terminal's file descriptor is non-blocking (as some parent
+        processes leave it), this waits until it's ready rather than
+        losing text.  Long text is written in pieces that fit in the
+        write buffer, so text that couldn't be written yet stays buffered.
+        """
+        global _last_writer
+        _last_writer = self
+        for start in range(0, len(text), _MAX_WRITE_SIZE):
+            with suppress(BlockingIOError):  # Still buffered, so just flush
+                self._write_raw(text[start : start + _MAX_WRITE_SIZE])
+            _retry_blocking(self._flush_raw, self)
+
+    def _write_undramatically(self, text):
+        """
+        Write text right away, after any text held back to check for repeats.
+
+        The text is still copied to the tee file (if there is one).
+        """
+        if self.tee is not None:
+            self.tee.write(text)
+            self.tee.flush()
+        self._write_pending()
+        self._write_now(text)
+        if text:
+            self._line_dirty = text[-1] != "\n"
+        if self._repeats is not None:
+            self._repeats.run = 0
+
+    def _write_lines(self, string):
+        """
+        Write text line by line, checking each new line for repeats.
+
+        Text starting a line is held until its line ends (or until the
+        next flush) so the whole line can be checked.
+        """
+        string, self._pending = self._pending + string, ""
+        for line in _LINE_RE.findall(string):
+            if self._line_dirty or not line.strip():
+                self._write_dramatically(line)
+                self._line_dirty = line[-1] != "\n"
+                self._repeats.run = 0  # Repeats are only consecutive if adjacent
+            elif line[-1] != "\n":
+                self._pending = line
+            else:
+                self._write_line(line)
+
+    def _write_line(self, line):
+        repeated = self._repeats.seen(line)
+        if self._repeats.mode == "collapse" and self._repeats.run > 1:
+            up = "\x1b[A\r" if self._marker_is_last_line() else ""  # Update marker
+            self._write_now(f"{up}(repeated {self._repeats.run} times)\n")
+        elif repeated and self._repeats.mode == "fast":
+            self._write_now(line)
+        else:
+            self._write_dramatically(line)
+
+    def _marker_is_last_line(self):
+        """
+        Return True if our repeat marker is still the last line written.
+
+        Other writes (from the other standard stream, binary writes, and
+        so on) start a new marker instead, so they're never overwritten.
+        Writes to a non-dramatic standard stream can't be seen, so markers
+        aren't updated when one shares this terminal.
+        """
+        return (
+            self._repeats.run > 2
+            and _last_writer is self
+            and not _shares_terminal_with_plain_stream(self)
+        )
+
+    def _write_pending(self):
+        """Write any text held back to check for repeats."""
+        if self._pending:
+            pending, self._pending = self._pending, ""
+            self._write_dramatically(pending)
+            self._line_dirty = True
+            self._repeats.run = 0
+
+    def _write_dramatically(self, string):
+        start = 0
+        for end, count in zip(*_plans.get(string, self.frame_size)):
+            before = perf_counter()
+            self._write_now(string[start:end])
+            self._pause(before, count)
+            start = end
+
+    def _pause(self, before, count=1):
+        """Pause after writing characters (unless Ctrl-C was just pressed)."""
+        if before >= self.no_sleep_until:
+            try:
+                if self.drain:
+                    self._drain()
+                elapsed = perf_counter() - before
+                sleep_duration = count / self.speed - elapsed
+                if sleep_duration > 0:
+                    sleep(sleep_duration)
+            except KeyboardInterrupt:
+                self.no_sleep_until = perf_counter() + 0.5
+
+    def _write_frames(self, string):
+        """
+        Write text containing carriage returns, coalescing redrawn frames.
+
+        Once a line is being redrawn, each frame is written immediately
+        and frames that the next frame in this same write would completely
+        overwrite are skipped.
+        """
+        pieces = _LINE_BREAK_RE.split(string)
+        redrawn = []
+        for index in range(0, len(pieces), 2):
+            text = pieces[index]
+            end = pieces[index + 1] if index + 1 < len(pieces) else ""
+            if not self._redrawing:
+                self._write_dramatically(text + end)
+            elif not (
+                end == "\r"
+                and not self._line_dirty
+                and _overwrites(pieces[index + 2], text)
+            ):
+                redrawn.append(text + end)
+            if end == "\n":
+                if redrawn:
+                    self._write_now("".join(redrawn))
+                    redrawn.clear()
+                self._redrawing = self._line_dirty = False
+            elif end == "\r":
+                self._redrawing = self._redrawing or self._line_dirty or bool(text)
+                self._line_dirty = False
+            elif text:
+                self._line_dirty = True
+        if redrawn:
+            self._write_now("".join(redrawn))
+
+    def _drain(self):
+        """Wait until the terminal has transmitted everything written."""
+        with suppress(OSError, termios.error):
+            termios.tcdrain(self.fileno())
+
+
+class DramaticTextProxy(_DramaticWriter):
+    """
+    Text stream to "dramatically" write to another text stream.
+
+    This writes to the original stream character-by-character, pausing
+    in between each character.  Text isn't re-encoded, so the original
+    stream's encoding, errors, and newline handling are all respected.
+    Everything besides writing is passed through to the original stream.
+
+    The speed argument controls how many characters per second to write.
+
+    The drain argument makes each character wait until the terminal has
+    actually transmitted it (rather than just queued it).
+
+    The repeated argument ("fast" or "collapse") hurries through lines
+    that repeat one of the last repeat_window lines, or collapses
+    consecutive repeats into a "(repeated N times)" marker.
+
+    The frame_rate argument writes all the characters due in each frame
+    at once (frame_rate times per second) instead of one at a time.
+
+    The tee argument is a text file that gets an immediate (undramatic)
+    copy of everything written.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_line_dirty",
+        "_pending",
+        "_redrawing",
+        "_repeats",
+        "drain",
+        "frame_size",
+        "no_sleep_until",
+        "speed",
+        "stream",
+        "tee",
+    )
+
+    def __init__(
+        self,
+        stream,
+        *,
+        speed=None,
+        drain=False,
+        repeated=None,
+        repeat_window=None,
+        frame_rate=None,
+        tee=None,
+    ):
+        self.stream = stream
+        self._buffer = None
+        self._setup(speed, drain, repeated, repeat_window, frame_rate, tee)
+
+    @property
+    def buffer(self):
+        """Binary stream that writes to the original stream's buffer dramatically."""
+        if self._buffer is None:
+            self._buffer = DramaticBufferedWriter(self.stream.buffer, self)
+        return self._buffer
+
+    def flush(self):
+        super().flush()
+        if self._buffer is not None:
+            self._buffer.flush()
+
+    def _write_raw(self, text):
+        self.stream.write(text)
+
+    def _flush_raw(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.stream!r})"
+
+
+def _utf8_boundaries(data):
+    """
+    Yield the end offset of each complete UTF-8 character in data.
+
+    Bytes that aren't valid UTF-8 count as characters of their own, so
+    only a valid (but incomplete) character at the end is held back.
+    """
+    index, length = 0, len(data)
+    while index < length:
+        lead = data[index]
+        size = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+        if not 0xC0 <= lead < 0xF8:  # ASCII or not a valid lead byte
+            size = 1
+        end = index + 1
+        while end < min(index + size, length) and 0x80 <= data[end] < 0xC0:
+            end += 1
+        if end == length and end < index + size:
+            return
+        index = end
+        yield index
+
+
+def _tee_bytes(tee, data):
+    """Write bytes to a tee file right away, after any text written to it."""
+    tee.flush()
+    if hasattr(tee, "buffer"):
+        tee.buffer.write(data)
+        tee.buffer.flush()
+    else:
+        tee.write(bytes(data).decode("utf-8", "replace"))
+        tee.flush()
+
+
+class DramaticBufferedWriter:
+    """
+    Binary file to "dramatically" write to another binary file.
+
+    This writes UTF-8 bytes to the original binary file one character at
+    a time (never splitting a multibyte character), pausing in between
+    each character.  Characters are written as memoryview slices so large
+    writes aren't copied.  Everything besides writing is passed through to
+    the original binary file.
+
+    Pacing (and any tee file) is shared with the given dramatic text
+    stream, which is flushed before bytes are written so text and bytes
+    stay in order.  Like the text stream, this waits for non-blocking
+    terminals to be ready.
+    """
+
+    __slots__ = ("_partial", "stream", "text")
+
+    def __init__(self, stream, text):
+        self.stream = stream
+        self.text = text
+        self._partial = b""
+
+    def write(self, data):
+        """Write dramatically, but only if this is a terminal device."""
+        view = memoryview(data).cast("B")
+        size = view.nbytes
+        _DramaticWriter.flush(self.text)  # Not our own partial character
+        if self.text.tee is not None:
+            _tee_bytes(self.text.tee, view)
+        if not self.stream.isatty():
+            self.stream.write(view)
+            return size
+        if self.text._repeats is not None:
+            self.text._repeats.run = 0
+        if self._partial:
+            view = memoryview(self._partial + view)
+        start = end = count = 0
+        before = perf_counter()
+        for end in _utf8_boundaries(view):
+            count += 1
+            if count == self.text.frame_size:
+                self._write_frame(view[start:end], before, count)
+                start, count, before = end, 0, perf_counter()
+        if count:
+            self._write_frame(view[start:end], before, count)
+            start = end
+        self._partial = bytes(view[start:])
+        return size
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def _write_frame(self, frame, before, count):
+        global _last_writer
+        _last_writer = self
+        self.stream.write(frame)
+        _retry_blocking(self.stream.flush, self.stream)
+        self.text._pause(before, count)
+
+    def flush(self):
+        if self._partial:
+            self.stream.write(self._partial)
+            self._partial = b""
+        _retry_blocking(self.stream.flush, self.stream)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.stream!r})"
+
+
+class DramaticTextIOWrapper(_DramaticWriter, TextIOWrapper):
+    """
+    Text file to "dramatically" write to a buffer.
+
+    This writes to the underlying buffer character-by-character, pausing
+    in between each character.  DramaticTextProxy is used by default, but
+    this is handy for wrapping a binary buffer directly.
+
+    The speed argument controls how many characters per second to write.
+
+    The drain argument makes each character wait until the terminal has
+    actually transmitted it (rather than just queued it), which keeps
+    pacing accurate over slow connections like SSH or serial consoles.
+
+    The repeated, repeat_window, frame_rate, and tee arguments work like
+    DramaticTextProxy's.
+
+    Unlike DramaticTextProxy, bytes written to this file's buffer are
+    written right away (without drama or a copy in the tee file).
+    """
+
+    def __init__(
+        self,
+        *args,
+        speed=None,
+        drain=False,
+        repeated=None,
+        repeat_window=None,
+        frame_rate=None,
+        tee=None,
+        **kwargs,
+    ):
+        self._setup(speed, drain, repeated, repeat_window, frame_rate, tee)
+        super().__init__(*args, **kwargs)
+
+    def __del__(self):
+        """Detach the buffer so it won't close as we're deleted."""
+        with suppress(ValueError):  # In case buffer is already closed
+            self.detach()
+        super().__del__()
+
+    def _write_raw(self, text):
+        TextIOWrapper.write(self, text)
+
+    def _flush_raw(self):
+        TextIOWrapper.flush(self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.buffer})"
+
+
+class _Pacer:
+    """
+    Deadline-based schedule for writing characters at a given speed.
+
+    Each character is due one interval after the one before it.  Time
+    spent elsewhere (waiting on a slow source or a slow write) counts
+    toward the next deadline instead of adding extra delay.
+
+    The speed isn't capped to this terminal's calibrated speed, since
+    paced text doesn't always end up on this terminal.
+    """
+
+    def __init__(self, speed=None, clock=None):
+        self.interval = 1 / (_DEFAULT_SPEED if speed is None else speed)
+        self.clock = perf_counter if clock is None else clock
+        self.deadline = self.clock()
+        self.no_sleep_until = self.deadline
+
+    def schedule(self, count=1):
+        """Return seconds to wait before writing the next count characters."""
+        now = self.clock()
+        if self.deadline < now or now < self.no_sleep_until:
+            self.deadline = now
+        delay = self.deadline - now
+        self.deadline += count * self.interval
+        return delay
+
+    def wait(self, count=1):
+        """
+        Sleep until the next count characters are due.
+
+        If Ctrl-C is pressed, sleeping stops for half a second.
+        """
+        delay = self.schedule(count)
+        if delay > 0:
+            try:
+                sleep(delay)
+            except KeyboardInterrupt:
+                self.no_sleep_until = self.clock() + 0.5
+
+
+def _undramatic_writer(file):
+    """Return a function that writes and flushes text without any drama."""
+    if isinstance(file, _DramaticWriter):
+        return file._write_undramatically
+
+    def write(text):
+        file.write(text)
+        file.flush()
+
+    return write
+
+
+def stream(chunks, *, speed=None, file=None):
+    """
+    Dramatically write text chunks from an iterable as they're produced.
+
+    Chunks are consumed lazily, so only the chunk being written is held
+    in memory.  Time spent waiting for the next chunk counts toward the
+    pause before its first character, so slow sources aren't slowed
+    down any further.
+
+    If an async iterable is given, a coroutine is returned to be awaited.
+
+    The speed argument controls how many characters per second to write.
+    """
+    if file is None:
+        file = sys.stdout
+    if hasattr(chunks, "__aiter__"):
+        return _astream(chunks, speed=speed, file=file)
+    write = _undramatic_writer(file)
+    if not file.isatty():
+        for chunk in chunks:
+            write(chunk)
+        return None
+    pacer = _Pacer(_capped_speed(speed))
+    for chunk in chunks:
+        for char in chunk:
+            pacer.wait()
+            write(char)
+    return None
+
+
+async def _astream(chunks, *, speed, file):
+    """Asynchronous version of stream for async iterables."""
+    import asyncio  # Imported lazily because it's slow to import
+
+    write = _undramatic_writer(file)
+    if not file.isatty():
+        async for chunk in chunks:
+            write(chunk)
+        return
+    pacer = _Pacer(_capped_speed(speed))
+    async for chunk in chunks:
+        for char in chunk:
+            delay = pacer.schedule()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            write(char)
+
+
+def _paces_response(headers):
+    """Return True if a response with the given headers should be paced."""
+    headers = {name.lower(): value for name, value in headers}
+    content_type = headers.get("content-type", "")
+    return content_type.startswith("text/") and "content-encoding" not in headers
+
+
+class _PacedBody:
+    """
+    Split a response body into paced frames of whole UTF-8 characters.
+
+    Each frame holds the characters due within one frame interval, so
+    high speeds wake up once per frame instead of once per character.
+    A character split between two chunks is held until the next chunk.
+    """
+
+    def __init__(self, speed=None, frame_rate=None):
+        if speed is None:
+            speed = _DEFAULT_SPEED
+        if frame_rate is None:
+            frame_rate = _DEFAULT_FRAME_RATE
+        self.pacer = _Pacer(speed)
+        self.frame_size = _frame_size(speed, frame_rate)
+        self.partial = b""
+
+    def frames(self, data):
+        """Yield (delay, frame) pairs for the next chunk of body bytes."""
+        view = memoryview(data).cast("B")
+        if self.partial:
+            view = memoryview(self.partial + view)
+        start = end = count = 0
+        for end in _utf8_boundaries(view):
+            count += 1
+            if count == self.frame_size:
+                yield self.pacer.schedule(count), bytes(view[start:end])
+                start, count = end, 0
+        if count:
+            yield self.pacer.schedule(count), bytes(view[start:end])
+            start = end
+        self.partial = bytes(view[start:])
+
+
+class DramaticASGIMiddleware:
+    """
+    ASGI middleware to stream text responses dramatically.
+
+    Bodies of text/* responses (including chunked and server-sent event
+    responses) are sent a frame of characters at a time, with asyncio
+    timers in between, so many paced responses can share one worker.
+    Other responses are passed through untouched.
+
+    The speed argument controls how many characters per second to send.
+    The frame_rate argument controls how many times per second to send.
+    """
+
+    def __init__(self, app, *, speed=None, frame_rate=None):
+        self.app = app
+        self.speed = speed
+        self.frame_rate = frame_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        import asyncio  # Imported lazily because it's slow to import
+
+        body = None
+
+        async def dramatic_send(message):
+            nonlocal body
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                ]
+                if _paces_response(headers):
+                    body = _PacedBody(self.speed, self.frame_rate)
+            elif message["type"] == "http.response.body" and body is not None:
+                for delay, frame in body.frames(message.get("body", b"")):
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    await send(
+                        {"type": "http.response.body", "body": frame, "more_body": True}
+                    )
+                more_body = message.get("more_body", False)
+                message = {**message, "body": b"", "more_body": more_body}
+                if not more_body:
+                    message["body"], body.partial = body.partial, b""
+            await send(message)
+
+        await self.app(scope, receive, dramatic_send)
+
+
+class DramaticWSGIMiddleware:
+    """
+    WSGI middleware to stream text responses dramatically.
+
+    Bodies of text/* responses are yielded a frame of characters at a
+    time, sleeping once per frame rather than once per character.  Other
+    responses are passed through untouched.
+
+    The speed argument controls how many characters per second to send.
+    The frame_rate argument controls how many times per second to send.
+    """
+
+    def __init__(self, app, *, speed=None, frame_rate=None):
+        self.app = app
+        self.speed = speed
+        self.frame_rate = frame_rate
+
+    def __call__(self, environ, start_response):
+        paced = False
+
+        def dramatic_start_response(status, headers, exc_info=None):
+            nonlocal paced
+            paced = _paces_response(headers)
+            return start_response(status, headers, exc_info)
+
+        chunks = self.app(environ, dramatic_start_response)
+        return self._respond(chunks, lambda: paced)
+
+    def _respond(self, chunks, is_paced):
+        try:
+            body = None
+            for chunk in chunks:
+                if body is None and is_paced():
+                    body = _PacedBody(self.speed, self.frame_rate)
+                if body is None:
+                    yield chunk
+                    continue
+                for delay, frame in body.frames(chunk):
+                    if delay > 0:
+                        sleep(delay)
+                    yield frame
+            if body is not None and body.partial:
+                yield body.partial
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+
+class _DramaticPatcher(ContextDecorator):
+    """
+    Monkey patch sys.stdout or sys.stderr to print dramatically.
+
+    This replaces stdout/stderr (based on the stream name given) with
+    a DramaticTextProxy that writes to the original stream.
+
+    The speed argument controls how many characters per second to write.
+    """
+
+    def __init__(self, stream_name, speed=None):
+        self.name = stream_name
+        self.old = getattr(sys, stream_name)
+        self.new = None
+        self.speed = speed
+
+    def __enter__(self):
+        self.old = getattr(sys, self.name)
+        if not isinstance(self.old, _DramaticWriter):
+            self.new = DramaticTextProxy(self.old, speed=self.speed)
+            setattr(sys, self.name, self.new)
+        return self.new
+
+    def __exit__(self, *args):
+        setattr(sys, self.name, self.old)
+        self.new = None
+
+
+class _CombinedDramaticPatcher(ContextDecorator):
+    """
+    Monkey patch both sys.stdout and sys.stderr to print dramatically.
+
+    This can be used as a context manager or as a decorator.
+
+    The speed argument controls how many characters per second to write.
+    """
+
+    def __init__(self, speed=None):
+        self.speed = speed
+        self.stack = ExitStack()
+
+    def at_speed(self, speed):
+        """Control the characters per second when printing."""
+        return type(self)(speed)
+
+    def __enter__(self):
+        self.stack.enter_context(_DramaticPatcher("stdout", speed=self.speed))
+        self.stack.enter_context(_DramaticPatcher("stderr", speed=self.speed))
+
+    def __exit__(self, *args):
+        self.stack.close()
+
+
+def _attach_shared_memory(name):
+    """Attach to existing shared memory without tracking it for cleanup."""
+    from multiprocessing import resource_tracker, shared_memory
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    memory = shared_memory.SharedMemory(name)
+    resource_tracker.unregister(memory._name, "shared_memory")
+    return memory
+
+
+class _RingBuffer:
+    """
+    Single-producer, single-consumer byte queue in shared memory.
+
+    The header holds the capacity, the total bytes written (only updated
+    by the producer), the total bytes read (only updated by the consumer)
+    and whether the producer has closed the ring.
+    """
+
+    def __init__(self, name=None, size=_RING_SIZE):
+        # Imported lazily because only the renderer process mode needs it
+        from multiprocessing import shared_memory
+
+        if name is None:
+            self.memory = shared_memory.SharedMemory(
+                create=True, size=_RING_HEADER_SIZE + size
+            )
+            self.memory.buf[:_RING_HEADER_SIZE] = bytes(_RING_HEADER_SIZE)
+            _RING_COUNT.pack_into(self.memory.buf, _RING_CAPACITY, size)
+        else:
+            self.memory = _attach_shared_memory(name)
+        self.name = self.memory.name
+        self.capacity = self._count(_RING_CAPACITY)
+
+    def _count(self, offset):
+        return _RING_COUNT.unpack_from(self.memory.buf, offset)[0]
+
+    @property
+    def closed(self):
+        return bool(self.memory.buf[_RING_CLOSED])
+
+    @closed.setter
+    def closed(self, closed):
+        self.memory.buf[_RING_CLOSED] = closed
+
+    def put(self, *parts):
+        """Copy all given parts into the ring (or none if they don't fit)."""
+        written = self._count(_RING_WRITTEN)
+        size = sum(len(part) for part in parts)
+        if size > self.capacity - (written - self._count(_RING_READ)):
+            return False
+        buffer = self.memory.buf[_RING_HEADER_SIZE:]
+        position = written % self.capacity
+        for part in parts:
+            first = min(len(part), self.capacity - position)
+            buffer[position : position + first] = part[:first]
+            buffer[: len(part) - first] = part[first:]
+            position = (position + len(part)) % self.capacity
+        buffer.release()
+        _RING_COUNT.pack_into(self.memory.buf, _RING_WRITTEN, written + size)
+        return True
+
+    def get(self):
+        """Remove and return all bytes waiting in the ring."""
+        read = self._count(_RING_READ)
+        size = self._count(_RING_WRITTEN) - read
+        if not size:
+            return b""
+        buffer = self.memory.buf[_RING_HEADER_SIZE:]
+        start = read % self.capacity
+        end = start + size
+        data = bytes(buffer[start : min(end, self.capacity)])
+        if end > self.capacity:
+            data += bytes(buffer[: end - self.capacity])
+        buffer.release()
+        _RING_COUNT.pack_into(self.memory.buf, _RING_READ, read + size)
+        return data
+
+    def close(self, unlink=False):
+        self.memory.close()
+        if unlink:
+            self.memory.unlink()
+
+
+def _records(data):
+    """Yield the stream number and bytes of each record in the given data."""
+    offset = 0
+    while offset < len(data):
+        stream_number, length = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        yield stream_number, data[offset : offset + length]
+        offset += length
+
+
+class _Renderer:
+    """
+    Renderer subprocess that writes dramatically on behalf of this process.
+
+    Text written to sys.stdout (stream 1) and sys.stderr (stream 2) is
+    copied into a shared memory ring buffer which the renderer reads from
+    and writes dramatically to the terminal.  Pacing then happens on
+    another core instead of competing with this process for the GIL.
+
+    If the renderer crashes, anything it didn't get to is written here and
+    later writes fall back to in-process DramaticTextProxy objects.
+
+    The ring only supports one writer at a time, so writes from different
+    threads take turns.
+    """
+
+    def __init__(self, streams, **options):
+        # Imported lazily because only the renderer process mode needs it
+        import subprocess
+
+        self.streams = streams
+        self.options = options  # DramaticTextProxy arguments
+        self.ring = _RingBuffer()
+        self.fallbacks = None
+        self.lock = Lock()
+        for stream in streams.values():
+            stream.flush()
+        command = [sys.executable, "-S", __file__, "--render", self.ring.name]
+        for name, value in options.items():
+            flag = "--" + name.replace("_", "-")
+            if value is True:
+                command.append(flag)
+            elif value is not None and value is not False:
+                command += [flag, str(value)]
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=streams.get(1, sys.stdout).fileno(),
+            stderr=streams.get(2, sys.stderr).fileno(),
+        )
+
+    def write(self, stream_number, data):
+        """Copy data into the ring, waiting while the ring is full."""
+        data = memoryview(data)
+        with self.lock:
+            for start in range(0, len(data), _RECORD_MAX_SIZE):
+                chunk = data[start : start + _RECORD_MAX_SIZE]
+                header = _RECORD.pack(stream_number, len(chunk))
+                while self.fallbacks is None and not self.ring.put(header, chunk):
+                    if self.process.poll() is None:
+                        sleep(_RENDER_POLL_INTERVAL)
+                    else:
+                        self._recover()
+                if self.fallbacks is not None:
+                    self._write_fallback(stream_number, chunk)
+
+    def check(self):
+        """Fall back to writing in this process if the renderer crashed."""
+        with self.lock:
+            if self.fallbacks is None and self.process.poll() is not None:
+                self._recover()
+
+    def close(self):
+        """Wait for the renderer to write everything, then clean up."""
+        if self.fallbacks is None:
+            self.ring.closed = True
+            while True:
+                try:
+                    returncode = self.process.wait()
+                    break
+                except KeyboardInterrupt:  # The renderer will hurry up too
+                    continue
+            if returncode != 0:
+                self._recover()
+        for fallback in (self.fallbacks or {}).values():
+            fallback.flush()
+        self.ring.close(unlink=True)
+
+    def _recover(self):
+        """Write what the crashed renderer didn't read, then fall back."""
+        self.fallbacks = {
+            number: DramaticTextProxy(stream, **self.options)
+            for number, stream in self.streams.items()
+        }
+        self.decoders = {
+            number: getincrementaldecoder("utf-8")("replace") for number in self.streams
+        }
+        for stream_number, payload in _records(self.ring.get()):
+            self._write_fallback(stream_number, payload)
+
+    def _write_fallback(self, stream_number, data):
+        text = self.decoders[stream_number].decode(data)
+        self.fallbacks[stream_number].write(text)
+
+
+class _RendererStream:
+    """Text stream that hands everything written to a _Renderer."""
+
+    def __init__(self, renderer, stream_number, stream, tee=None):
+        self.renderer = renderer
+        self.stream_number = stream_number
+        self.stream = stream
+        self.tee = tee
+        self.buffer = _RendererBuffer(self)
+
+    def write(self, string):
+        if self.tee is not None:
+            self.tee.write(string)
+            self.tee.flush()
+        self.renderer.write(self.stream_number, string.encode("utf-8", "replace"))
+        return len(string)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self.renderer.check()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class _RendererBuffer:
+    """
+    Binary stream that hands everything written to a _Renderer.
+
+    Bytes are kept in order with text written to the _RendererStream.
+    The renderer decodes them as UTF-8 (replacing invalid bytes).
+    """
+
+    def __init__(self, text):
+        self.text = text
+
+    def write(self, data):
+        view = memoryview(data).cast("B")
+        if self.text.tee is not None:
+            _tee_bytes(self.text.tee, view)
+        self.text.renderer.write(self.text.stream_number, view)
+        return view.nbytes
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self.text.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.text.stream.buffer, name)
+
+
+def _render(name, **options):
+    """
+    Dramatically write what's sent through the named ring buffer.
+
+    Ctrl-C reaches the whole process group, so it hurries the renderer
+    along (as it would in-process) instead of raising KeyboardInterrupt,
+    which could interrupt a write partway through.
+    """
+    # Imported lazily because only the renderer process needs it
+    import signal
+
+    parent = os.getppid()
+    ring = _RingBuffer(name)
+    streams = {
+        1: DramaticTextProxy(sys.stdout, **options),
+        2: DramaticTextProxy(sys.stderr, **options),
+    }
+
+    def hurry(signum, frame):
+        for stream in streams.values():
+            stream.no_sleep_until = perf_counter() + 0.5
+
+    signal.signal(signal.SIGINT, hurry)
+    sys.stdout, sys.stderr = streams[1], streams[2]  # So both are dramatic
+    decoders = {number: getincrementaldecoder("utf-8")("replace") for number in streams}
+    current = streams[1]
+    while True:
+        closed = ring.closed
+        data = ring.get()
+        for stream_number, payload in _records(data):
+            if streams[stream_number] is not current:
+                current.flush()  # Keep stdout and stderr writes in order
+                current = streams[stream_number]
+            current.write(decoders[stream_number].decode(payload))
+        if not data:
+            if closed or os.getppid() != parent:
+                break
+            for stream in streams.values():
+                stream.flush()
+            sleep(_RENDER_POLL_INTERVAL)
+    for stream in streams.values():
+        stream.flush()
+    ring.close()
+
+
+_renderer = None
+_tee_file = None
+
+
+def start(
+    *,
+    speed=None,
+    stdout=True,
+    stderr=True,
+    drain=False,
+    process=False,
+    repeated=None,
+    repeat_window=None,
+    frame_rate=None,
+    tee=None,
+):
+    """
+    Monkey patch sys.stdout and sys.stderr to print dramatically.
+
+    The speed argument controls how many characters per second to write.
+    The drain argument paces by what the terminal has actually displayed.
+    The process argument moves the dramatic writing to a subprocess.
+    The repeated argument ("fast" or "collapse") hurries through repeated
+    lines or collapses them (checking the last repeat_window lines).
+    The frame_rate argument writes characters in frames (per second).
+    The tee argument is a file path (or text file) to immediately copy
+    everything written to, without any drama.
+    """
+    global _original_stdout, _original_stderr, _renderer, _tee_file
+    if isinstance(tee, (str, os.PathLike)):
+        tee = _tee_file = open(tee, "w", encoding="utf-8")  # noqa: SIM115
+    options = {
+        "speed": speed,
+        "drain": drain,
+        "repeated": repeated,
+        "repeat_window": repeat_window,
+        "frame_rate": frame_rate,
+    }
+    if process:
+        streams = {1: sys.stdout, 2: sys.stderr}
+        _renderer = _Renderer(streams, **options)
+        atexit.register(stop)
+    if stdout:
+        _original_stdout = sys.stdout
+        if process:
+            sys.stdout = _RendererStream(_renderer, 1, sys.stdout, tee)
+        else:
+            sys.stdout = DramaticTextProxy(sys.stdout, **options, tee=tee)
+    if stderr:
+        _original_stderr = sys.stderr
+        if process:
+            sys.stderr = _RendererStream(_renderer, 2, sys.stderr, tee)
+        else:
+            sys.stderr = DramaticTextProxy(sys.stderr, **options, tee=tee)
+
 
-from argparse import ArgumentParser
-import code
-from contextlib import ContextDecorator, ExitStack, suppress
-from fractions import Fraction
-from importlib.util import find_spec
-from io import TextIOWrapper
-from pathlib import Path
-import runpy
-from site import getsitepackages, getusersitepackages
-import sys
-from textwrap import dedent
-from time import perf_counter, sleep
+def stop():
+    """Undo any dramatic monkey patching of sys.stdout or sys.stderr."""
+    global _renderer, _tee_file
+    for stream in (sys.stdout, sys.stderr):
+        if isinstance(stream, _DramaticWriter):
+            with suppress(ValueError):  # The original stream may be closed
+                stream.flush()  # Write anything held back (like partial lines)
+    if isinstance(sys.stdout, (_DramaticWriter, _RendererStream)):
+        sys.stdout = _original_stdout
+    if isinstance(sys.stderr, (_DramaticWriter, _RendererStream)):
+        sys.stderr = _original_stderr
+    if _renderer is not None:
+        _renderer.close()
+        _renderer = None
+    if _tee_file is not None:
+        _tee_file.close()
+        _tee_file = None
 
-__version__ = "0.5.0"
-__all__ = []  # Disable "from dramatic import *"
-_DEFAULT_SPEED = 75
 
+@contextmanager
+def _patch_stream(name, stream):
+    """Temporarily replace sys.stdout or sys.stderr (based on name)."""
+    old = getattr(sys, name)
+    setattr(sys, name, stream)
+    try:
+        yield stream
+    finally:
+        setattr(sys, name, old)
 
-class DramaticTextIOWrapper(TextIOWrapper):
-    """
-    Text file to "dramatically" write to a buffer.
 
-    This writes to the underlying buffer character-by-character, pausing
-    in between each character.
+class _BroadcastClient:
+    """
+    A viewer connected to a broadcast, with its own pacing.
 
-    The speed argument controls how many characters per second to write.
+    Text waiting to be written is kept in a backlog.  When the backlog
+    grows past max_backlog characters (because the viewer's connection
+    is slow) the oldest text is dropped so the viewer skips ahead.
     """
 
-    def __init__(self, *args, speed=None, **kwargs):
-        if speed is None:
-            speed = _DEFAULT_SPEED
-        self.no_sleep_until = perf_counter()
+    def __init__(self, writer, speed, max_backlog):
+        import asyncio  # Imported lazily because it's slow to import
+
+        self.writer = writer
         self.speed = speed
-        super().__init__(*args, **kwargs)
+        self.max_backlog = max_backlog
+        self.backlog = deque()
+        self.backlog_size = 0
+        self.ready = asyncio.Event()
+        self.closing = self.hurry = False
 
-    def __del__(self):
-        """Detach the buffer so it won't close as we're deleted."""
-        with suppress(ValueError):  # In case buffer is already closed
-            self.detach()
-        super().__del__()
+    def add(self, text):
+        """Add text to the backlog, dropping old text if it's too long."""
+        self.backlog.append(text)
+        self.backlog_size += len(text)
+        while self.backlog_size > self.max_backlog:
+            excess = self.backlog_size - self.max_backlog
+            if len(self.backlog[0]) <= excess:
+                self.backlog_size -= len(self.backlog.popleft())
+            else:
+                self.backlog[0] = self.backlog[0][excess:]
+                self.backlog_size -= excess
+        self.ready.set()
 
-    def write(self, string):
-        """
-        Write dramatically, but only if this is a terminal device.
+    def close(self, hurry=False):
+        """Stop once the backlog is written (immediately if hurry is true)."""
+        self.closing = True
+        self.hurry = self.hurry or hurry
+        self.ready.set()
 
-        If Ctrl-C is pressed, the remaining text will print immediately.
-        """
-        if self.isatty():
-            for char in string:
-                before = perf_counter()
-                super().write(char)
-                super().flush()
-                if before >= self.no_sleep_until:
-                    try:
-                        elapsed = perf_counter() - before
-                        sleep_duration = 1 / self.speed - elapsed
-                        if sleep_duration > 0:
-                            sleep(sleep_duration)
-                    except KeyboardInterrupt:
-                        self.no_sleep_until = perf_counter() + 0.5
-        else:
-            super().write(string)
+    async def run(self):
+        """Write the backlog dramatically until closed."""
+        import asyncio
 
-    def __repr__(self):
-        return f"{type(self).__name__}({self.buffer})"
+        pacer = _Pacer(self.speed, clock=asyncio.get_running_loop().time)
+        while True:
+            if not self.backlog:
+                if self.closing:
+                    break
+                self.ready.clear()
+                await self.ready.wait()
+                continue
+            text = self.backlog.popleft()
+            self.backlog_size -= len(text)
+            for index, char in enumerate(text):
+                if self.hurry:
+                    self.writer.write(text[index:].encode())
+                    break
+                delay = pacer.schedule()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.writer.write(char.encode())
+                await self.writer.drain()
+        await self.writer.drain()
 
 
-class _DramaticPatcher(ContextDecorator):
+class _BroadcastStream:
+    """Text stream that broadcasts everything written to another stream."""
+
+    def __init__(self, stream, broadcaster):
+        self.stream = stream
+        self.broadcaster = broadcaster
+
+    def write(self, string):
+        self.broadcaster.publish(string)
+        return self.stream.write(string)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class _Broadcaster(ContextDecorator):
     """
-    Monkey patch sys.stdout or sys.stderr to print dramatically.
+    Broadcast sys.stdout and sys.stderr dramatically to network viewers.
 
-    This replaces stdout/stderr (based on the stream name given) with
-    a DramaticTextIOWrapper that wraps around the stream's byte buffer.
+    A server (TCP for a (host, port) address or a Unix socket for a path)
+    runs on an asyncio event loop in a background thread.  Output is still
+    written to the terminal as usual and is also sent to each connected
+    viewer, with each viewer paced independently.
 
     The speed argument controls how many characters per second to write.
+    The max_backlog argument controls how many characters may wait to be
+    sent to a slow viewer before that viewer skips ahead.
     """
 
-    def __init__(self, stream_name, speed=None):
-        self.name = stream_name
-        self.old = getattr(sys, stream_name)
-        self.new = None
+    def __init__(self, address=None, *, speed=None, max_backlog=None):
+        if address is None:
+            address = (_DEFAULT_HOST, _DEFAULT_PORT)
+        if max_backlog is None:
+            max_backlog = _DEFAULT_MAX_BACKLOG
+        self.address = address
         self.speed = speed
+        self.max_backlog = max_backlog
+        self.clients = {}
+        self.loop = self.thread = self.server = None
+        self.stack = ExitStack()
 
     def __enter__(self):
-        self.old = getattr(sys, self.name)
-        if not isinstance(self.old, DramaticTextIOWrapper):
-            self.new = DramaticTextIOWrapper(self.old.buffer, speed=self.speed)
-            setattr(sys, self.name, self.new)
-        return self.new
+        import asyncio  # Imported lazily because it's slow to import
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._start_server(), self.loop).result()
+        for name in ("stdout", "stderr"):
+            stream = _BroadcastStream(getattr(sys, name), self)
+            self.stack.enter_context(_patch_stream(name, stream))
+        return self
 
     def __exit__(self, *args):
-        setattr(sys, self.name, self.old)
-        self.new = None
+        import asyncio
+
+        self.stack.close()
+        future = asyncio.run_coroutine_threadsafe(self._finish(), self.loop)
+        try:
+            future.result()
+        except KeyboardInterrupt:
+            self.loop.call_soon_threadsafe(self._hurry)
+            future.result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
 
+    def publish(self, text):
+        """Send text to every connected viewer."""
+        if text:
+            self.loop.call_soon_threadsafe(self._publish, text)
 
-class _CombinedDramaticPatcher(ContextDecorator):
+    def _publish(self, text):
+        for client in self.clients:
+            client.add(text)
+
+    def _hurry(self):
+        for client in self.clients:
+            client.close(hurry=True)
+
+    async def _start_server(self):
+        import asyncio
+
+        if isinstance(self.address, tuple):
+            host, port = self.address
+            self.server = await asyncio.start_server(self._serve, host, port)
+            self.address = self.server.sockets[0].getsockname()[:2]
+        else:
+            self.server = await asyncio.start_unix_server(self._serve, self.address)
+
+    async def _serve(self, reader, writer):
+        import asyncio
+
+        client = _BroadcastClient(writer, self.speed, self.max_backlog)
+        self.clients[client] = asyncio.current_task()
+        try:
+            await client.run()
+        except ConnectionError:
+            pass
+        finally:
+            del self.clients[client]
+            writer.close()
+
+    async def _finish(self):
+        import asyncio
+
+        self.server.close()
+        tasks = list(self.clients.values())
+        for client in self.clients:
+            client.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def broadcast(address=None, *, speed=None, max_backlog=None):
     """
-    Monkey patch both sys.stdout and sys.stderr to print dramatically.
+    Broadcast all output dramatically to viewers connected to a server.
+
+    The address may be a (host, port) tuple for a TCP server (the default
+    is 127.0.0.1 port 8075) or a path for a Unix socket server.  Viewers
+    can connect with a tool like nc:
+
+        nc 127.0.0.1 8075
 
     This can be used as a context manager or as a decorator.
+    """
+    return _Broadcaster(address, speed=speed, max_backlog=max_backlog)
 
-    The speed argument controls how many characters per second to write.
+
+class _Link:
     """
+    Deadline-based schedule for one direction of a simulated slow link.
 
-    def __init__(self, speed=None):
-        self.speed = speed
-        self.stack = ExitStack()
+    Bytes are sent one after another at bytes_per_second, so throughput
+    stays accurate over long transfers no matter how the data is split
+    up.  Once the link has been idle, the next bytes also take latency
+    seconds to arrive.
+    """
+
+    def __init__(self, bytes_per_second=None, latency=0):
+        self.interval = 0
+        self.chunk_size = None
+        if bytes_per_second is not None:
+            self.interval = 1 / bytes_per_second
+            self.chunk_size = _frame_size(bytes_per_second, _DEFAULT_FRAME_RATE)
+        self.latency = latency
+        self.drained = float("-inf")  # Idle until something is sent
+
+    def schedule(self, count):
+        """Return seconds until count bytes sent now would have arrived."""
+        now = perf_counter()
+        # Callers wait for their bytes to arrive, so bytes sent now would
+        # have been sent latency seconds ago if the caller hadn't waited.
+        # Falling behind the drained link by up to a frame is made up
+        # for, but after that the link is idle and the next bytes have to
+        # cross it from scratch.
+        sent = now - self.latency
+        if sent > self.drained + 1 / _DEFAULT_FRAME_RATE:
+            self.drained = now
+        self.drained += count * self.interval
+        return self.drained + self.latency - now
+
+    def chunks(self, data):
+        """Split data into the pieces it should be sent in."""
+        view = memoryview(data).cast("B")
+        size = self.chunk_size or len(view) or 1
+        for start in range(0, len(view), size):
+            yield view[start : start + size]
+
+
+def _sleep_for(delay):
+    if delay > 0:
+        sleep(delay)
 
-    def at_speed(self, speed):
-        """Control the characters per second when printing."""
-        return type(self)(speed)
+
+class _Throttled:
+    """
+    Socket or binary file that reads and writes through a slow link.
+
+    Reads return once the data would have arrived.  Writes are sent in
+    small pieces, each waiting until it would have crossed the link.
+    Reading and writing are paced separately, as on a full duplex link.
+    Everything else is passed through to the original object.
+    """
+
+    def __init__(self, obj, bytes_per_second=None, latency=0):
+        self.obj = obj
+        self.reading = _Link(bytes_per_second, latency)
+        self.writing = _Link(bytes_per_second, latency)
+
+    def _received(self, data):
+        if data:
+            _sleep_for(self.reading.schedule(len(data)))
+        return data
+
+    def read(self, *args):
+        return self._received(self.obj.read(*args))
+
+    def read1(self, *args):
+        return self._received(self.obj.read1(*args))
+
+    def readline(self, *args):
+        return self._received(self.obj.readline(*args))
+
+    def recv(self, *args):
+        return self._received(self.obj.recv(*args))
+
+    def readinto(self, buffer):
+        count = self.obj.readinto(buffer)
+        if count:
+            _sleep_for(self.reading.schedule(count))
+        return count
+
+    def recv_into(self, buffer, *args):
+        count = self.obj.recv_into(buffer, *args)
+        if count:
+            _sleep_for(self.reading.schedule(count))
+        return count
+
+    def write(self, data):
+        total = 0
+        for chunk in self.writing.chunks(data):
+            _sleep_for(self.writing.schedule(len(chunk)))
+            written = self.obj.write(chunk)
+            if written is None:  # Non-blocking raw file that would block
+                return total
+            if written < len(chunk):  # Partial raw write
+                return total + written
+            total += len(chunk)
+        return total
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def send(self, data, *args):
+        chunk = next(self.writing.chunks(data), b"")
+        _sleep_for(self.writing.schedule(len(chunk)))
+        return self.obj.send(chunk, *args)
+
+    def sendall(self, data, *args):
+        for chunk in self.writing.chunks(data):
+            _sleep_for(self.writing.schedule(len(chunk)))
+            self.obj.sendall(chunk, *args)
+
+    def __iter__(self):
+        return iter(self.readline, b"")
 
     def __enter__(self):
-        self.stack.enter_context(_DramaticPatcher("stdout", speed=self.speed))
-        self.stack.enter_context(_DramaticPatcher("stderr", speed=self.speed))
+        self.obj.__enter__()
+        return self
 
     def __exit__(self, *args):
-        self.stack.close()
+        return self.obj.__exit__(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.obj, name)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.obj!r})"
+
+
+class _ThrottledStreamReader:
+    """asyncio StreamReader that reads through a slow link."""
+
+    def __init__(self, reader, link):
+        self.reader = reader
+        self.link = link
+
+    async def _received(self, data):
+        import asyncio
+
+        if data:
+            delay = self.link.schedule(len(data))
+            if delay > 0:
+                await asyncio.sleep(delay)
+        return data
+
+    async def read(self, *args):
+        return await self._received(await self.reader.read(*args))
+
+    async def readline(self):
+        return await self._received(await self.reader.readline())
+
+    async def readexactly(self, n):
+        return await self._received(await self.reader.readexactly(n))
+
+    async def readuntil(self, *args):
+        return await self._received(await self.reader.readuntil(*args))
 
+    def __aiter__(self):
+        return self
 
-def start(*, speed=None, stdout=True, stderr=True):
+    async def __anext__(self):
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+
+    def __getattr__(self, name):
+        return getattr(self.reader, name)
+
+
+class _ThrottledStreamWriter:
     """
-    Monkey patch sys.stdout and sys.stderr to print dramatically.
+    asyncio StreamWriter that writes through a slow link.
+
+    Written data waits in a backlog that a background task sends through
+    the link.  Draining waits for the backlog to be sent.
+    """
+
+    def __init__(self, writer, link):
+        self.writer = writer
+        self.link = link
+        self.backlog = deque()
+        self.task = None
+
+    def write(self, data):
+        import asyncio
+
+        self.backlog.extend(self.link.chunks(bytes(data)))
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self._send_backlog())
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    async def _send_backlog(self):
+        import asyncio
+
+        while self.backlog:
+            chunk = self.backlog.popleft()
+            delay = self.link.schedule(len(chunk))
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.writer.write(chunk)
+            await self.writer.drain()
+
+    async def drain(self):
+        if self.task is not None:
+            await self.task
+        await self.writer.drain()
+
+    def close(self):
+        """Close once the backlog has been sent."""
+        if self.task is None or self.task.done():
+            self.writer.close()
+        else:
+            self.task.add_done_callback(lambda task: self.writer.close())
+
+    async def wait_closed(self):
+        if self.task is not None:
+            await self.task
+        await self.writer.wait_closed()
+
+    def __getattr__(self, name):
+        return getattr(self.writer, name)
+
+
+def throttle(obj, bytes_per_second=None, latency=0):
+    """
+    Wrap a socket, pipe, or binary file to simulate a slow network link.
+
+    Reads and writes are limited to bytes_per_second (unlimited if None)
+    and each transfer takes latency seconds to arrive.  Pacing is based
+    on deadlines, so throughput stays accurate over long transfers.
+
+    asyncio StreamReader and StreamWriter objects are wrapped with
+    versions that wait with asyncio timers instead of sleeping.
+    """
+    asyncio = sys.modules.get("asyncio")  # asyncio objects need asyncio imported
+    if asyncio is not None:
+        if isinstance(obj, asyncio.StreamReader):
+            return _ThrottledStreamReader(obj, _Link(bytes_per_second, latency))
+        if isinstance(obj, asyncio.StreamWriter):
+            return _ThrottledStreamWriter(obj, _Link(bytes_per_second, latency))
+    return _Throttled(obj, bytes_per_second, latency)
+
+
+class DramaticHandler(logging.StreamHandler):
+    """
+    Logging handler that writes log records dramatically.
+
+    Records are written to the given stream (sys.stderr by default)
+    character-by-character, pausing in between each character.
 
     The speed argument controls how many characters per second to write.
     """
-    if stdout:
-        global _original_stdout
-        _original_stdout = sys.stdout
-        sys.stdout = DramaticTextIOWrapper(sys.stdout.buffer, speed=speed)
-    if stderr:
-        global _original_stderr
-        _original_stderr = sys.stderr
-        sys.stderr = DramaticTextIOWrapper(sys.stderr.buffer, speed=speed)
 
+    def __init__(self, stream=None, speed=None):
+        if stream is None:
+            stream = sys.stderr
+        if not isinstance(stream, _DramaticWriter):
+            stream = DramaticTextProxy(stream, speed=speed)
+        super().__init__(stream)
 
-def stop():
-    """Undo any dramatic monkey patching of sys.stdout or sys.stderr."""
-    if isinstance(sys.stdout, DramaticTextIOWrapper):
-        sys.stdout = _original_stdout
-    if isinstance(sys.stderr, DramaticTextIOWrapper):
-        sys.stderr = _original_stderr
+
+class _DroppingQueueHandler(logging.Handler):
+    """
+    Queue handler that drops records instead of blocking on a full queue.
+
+    Dropped records are coalesced into a single warning record which is
+    queued as soon as there's room for it again.
+
+    This works like logging.handlers.QueueHandler, which isn't used
+    because logging.handlers is slow to import.
+    """
+
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+        self.dropped = 0
+
+    def emit(self, record):
+        """Queue a copy of the record with its message already formatted."""
+        try:
+            message = self.format(record)
+            record = copy(record)
+            record.message = record.msg = message
+            record.args = record.exc_info = record.exc_text = None
+            record.stack_info = None
+            self.enqueue(record)
+        except Exception:  # noqa: BLE001
+            self.handleError(record)
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self._dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def _dropped_record(self):
+        return logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "%d log records dropped",
+                "args": (self.dropped,),
+            }
+        )
+
+
+_log_logger = _log_queue_handler = _log_listener = None
+
+
+def start_logging(logger=None, *, speed=None, stream=None, maxsize=None):
+    """
+    Render log records dramatically from a background thread.
+
+    Records logged to the given logger (the root logger by default) are
+    put on a queue, so logging calls return right away, and a single
+    listener thread writes them to a DramaticHandler.
+
+    The speed argument controls how many characters per second to write.
+    The maxsize argument controls how many records may wait in the queue
+    before new records are dropped.
+
+    The DramaticHandler is returned so its formatter and level may be set.
+    """
+    # Imported lazily because it's slow to import
+    from logging.handlers import QueueListener
+
+    global _log_logger, _log_queue_handler, _log_listener
+    stop_logging()
+    if logger is None or isinstance(logger, str):
+        logger = logging.getLogger(logger)
+    if maxsize is None:
+        maxsize = _DEFAULT_LOG_QUEUE_SIZE
+    handler = DramaticHandler(stream, speed=speed)
+    _log_logger = logger
+    _log_queue_handler = _DroppingQueueHandler(Queue(maxsize))
+    _log_listener = QueueListener(
+        _log_queue_handler.queue, handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    _log_logger.addHandler(_log_queue_handler)
+    return handler
+
+
+@atexit.register
+def stop_logging():
+    """Stop dramatic logging, after writing any records still queued."""
+    global _log_logger, _log_queue_handler, _log_listener
+    if _log_listener is None:
+        return
+    _log_logger.removeHandler(_log_queue_handler)
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.flush()
+    _log_logger = _log_queue_handler = _log_listener = None
+
+
+def calibrate():
+    """
+    Measure how many characters per second the terminal can display.
+
+    The result is saved and speeds above it are capped from then on.
+    """
+    if termios is None or not sys.stdout.isatty():
+        sys.exit("Calibration requires a terminal.")
+    data = _CALIBRATION_TEXT.encode()
+    fd = sys.stdout.fileno()
+    sys.stdout.flush()
+    termios.tcdrain(fd)
+    before = perf_counter()
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+    termios.tcdrain(fd)
+    elapsed = perf_counter() - before
+    sys.stdout.buffer.write(b"\x1b[K")
+    sys.stdout.buffer.flush()
+    if elapsed <= 0:
+        sys.exit("Terminal was too fast to measure.")
+    speed = int(len(data) / elapsed)
+    path = _throughput_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{speed}\n")
+    _terminal_speed.cache_clear()
+    print(f"Terminal displays about {speed} characters per second.")
+    print(f"Wrote file {path}")
+
+
+def _installed_version(dramatic_pth):
+    """Return the version stamped in an installed _dramatic.pth (if any)."""
+    try:
+        first_line = dramatic_pth.read_text().partition("\n")[0]
+    except OSError:
+        return None
+    if first_line.startswith("# dramatic "):
+        return first_line.removeprefix("# dramatic ")
+    return "unknown"  # Installed before version stamps were written
+
+
+def _write_atomically(path, text):
+    """Write text to a file so other processes never see it half written."""
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(text)
+    os.replace(temporary, path)
+
+
+def _install_max_drama(site_packages, source, version):
+    """
+    Write _dramatic.py (and its .pyc) and the _dramatic.pth hook.
+
+    The .pth file is stamped with the version of the source written.
+    The paths written are returned.
+    """
+    import py_compile  # Imported lazily to keep importing dramatic cheap
+
+    dramatic_py = site_packages / "_dramatic.py"
+    dramatic_pth = site_packages / "_dramatic.pth"
+    _write_atomically(dramatic_py, source)
+    dramatic_pyc = py_compile.compile(str(dramatic_py), doraise=True)
+    _write_atomically(dramatic_pth, f"# dramatic {version}\n{_MAX_DRAMA_HOOK}")
+    return dramatic_py, Path(dramatic_pyc), dramatic_pth
+
+
+def _refresh_max_drama(site_packages):
+    """
+    Replace a --max-drama copy that doesn't match the installed dramatic.
+
+    The version stamped in _dramatic.pth is compared with the version of
+    the dramatic module that's installed (without importing it), so
+    upgrading dramatic also upgrades the copy.
+    """
+    with suppress(OSError, ValueError):
+        spec = find_spec("dramatic")
+        if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+            return
+        source = Path(spec.origin).read_text()
+        match = _VERSION_RE.search(source)
+        stamp = _installed_version(site_packages / "_dramatic.pth")
+        if match and stamp and match[1] != stamp:
+            _install_max_drama(site_packages, source, match[1])
+
+
+def _max_drama_start():
+    """Start drama from the _dramatic.pth hook (refreshing a stale copy)."""
+    _refresh_max_drama(Path(__file__).parent)
+    start()
 
 
 def parse_arguments():
@@ -179,6 +2131,19 @@ def parse_arguments():
         action="store_true",
         help="Undo --max-drama",
     )
+    parser.add_argument("--render", metavar="name", help=SUPPRESS)
+    parser.add_argument("--repeated", choices=["fast", "collapse"], help=SUPPRESS)
+    parser.add_argument("--repeat-window", type=int, help=SUPPRESS)
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="measure and save how fast this terminal displays text",
+    )
+    parser.add_argument(
+        "--drain",
+        action="store_true",
+        help="pace by what the terminal has displayed, not just written",
+    )
     parser.add_argument(
         "-m",
         metavar="mod",
@@ -192,6 +2157,17 @@ def parse_arguments():
         type=Fraction,
         help=f"characters per second (default: {_DEFAULT_SPEED})",
     )
+    parser.add_argument(
+        "--frame-rate",
+        metavar="fps",
+        type=_positive_fraction,
+        help="write characters in this many frames per second",
+    )
+    parser.add_argument(
+        "--tee",
+        metavar="file",
+        help="also write all output (without drama) to this file",
+    )
     parser.add_argument(
         "file",
         nargs="?",
@@ -212,8 +2188,29 @@ def repl_banner():
 
 
 def main():
+    if sys.argv[1:2] == ["serve"]:
+        serve()
+        return
     args, unknown = parse_arguments()
-    start(speed=args.speed)
+    if args.render:
+        _render(
+            args.render,
+            speed=args.speed,
+            drain=args.drain,
+            repeated=args.repeated,
+            repeat_window=args.repeat_window,
+            frame_rate=args.frame_rate,
+        )
+        return
+    if args.calibrate:
+        calibrate()
+        sys.exit(0)
+    start(
+        speed=args.speed,
+        drain=args.drain,
+        frame_rate=args.frame_rate,
+        tee=args.tee,
+    )
 
     # Monkey patch Python so all Python programs to print dramatically
     if args.max_drama:
@@ -226,6 +2223,9 @@ def main():
             print("Make all global Python scripts run dramatically?")
         dramatic_py = site_packages / "_dramatic.py"
         dramatic_pth = site_packages / "_dramatic.pth"
+        installed = _installed_version(dramatic_pth)
+        if installed and installed != __version__:
+            print(f"Replacing dramatic {installed} with dramatic {__version__}.")
         print("Running with --min-drama will undo this operation.")
         try:
             if input("Are you sure? [y/N] ").casefold() != "y":
@@ -233,10 +2233,9 @@ def main():
         except KeyboardInterrupt:
             sys.exit("\nOkay. No drama.")
         site_packages.mkdir(parents=True, exist_ok=True)
-        dramatic_py.write_text(Path(__file__).read_text())
-        print(f"Wrote file {dramatic_py}")
-        dramatic_pth.write_text("import _dramatic; _dramatic.start()\n")
-        print(f"Wrote file {dramatic_pth}")
+        source = Path(__file__).read_text()
+        for path in _install_max_drama(site_packages, source, __version__):
+            print(f"Wrote file {path}")
         print("To undo run:")
         print(f"{sys.executable} -m _dramatic --min-drama")
         sys.exit(0)
@@ -264,9 +2263,18 @@ def main():
             print(f"File not found: {dramatic_py}")
         else:
             print(f"Deleted file {dramatic_py}")
+        with suppress(FileNotFoundError):
+            dramatic_pyc = Path(cache_from_source(str(dramatic_py)))
+            dramatic_pyc.unlink()
+            print(f"Deleted file {dramatic_pyc}")
         print("No drama.")
         sys.exit(0)
 
+    _run_python(args, unknown)
+
+
+def _run_python(args, unknown):
+    """Run the given Python module or file, or start a REPL."""
     # Run the given Python module
     if args.module:
         try:
@@ -296,6 +2304,61 @@ def main():
         )
 
 
+def parse_serve_arguments():
+    parser = ArgumentParser(
+        prog=f"{Path(sys.argv[0]).name} serve",
+        description="Run Python, broadcasting its output dramatically to viewers",
+    )
+    parser.add_argument(
+        "--host",
+        default=_DEFAULT_HOST,
+        help=f"host to listen on (default: {_DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        default=_DEFAULT_PORT,
+        type=int,
+        help=f"TCP port to listen on (default: {_DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--unix",
+        metavar="path",
+        help="listen on a Unix socket at this path instead of a TCP port",
+    )
+    parser.add_argument(
+        "-m",
+        metavar="mod",
+        dest="module",
+        help="run library module as a script",
+    )
+    parser.add_argument(
+        "--speed",
+        metavar="speed",
+        default=_DEFAULT_SPEED,
+        type=Fraction,
+        help=f"characters per second (default: {_DEFAULT_SPEED})",
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        help="program read from script file",
+    )
+    return parser.parse_known_args(sys.argv[2:])
+
+
+def serve():
+    args, unknown = parse_serve_arguments()
+    address = args.unix or (args.host, args.port)
+    with broadcast(address, speed=args.speed) as broadcaster:
+        if args.unix:
+            where, command = args.unix, f"nc -U {args.unix}"
+        else:
+            host, port = broadcaster.address
+            where, command = f"{host} port {port}", f"nc {host} {port}"
+        sys.stderr.write(f"Broadcasting on {where} (connect with: {command})\n")
+        _run_python(args, unknown)
+
+
 output = _CombinedDramaticPatcher()
 print = output(print)
 
@@ -29,6 +29,13 @@ def reload_module(mocks):
     reload(dramatic)
 
 
+@pytest.fixture(autouse=True)
+def cache_home(monkeypatch, tmp_path):
+    """Keep terminal calibration results out of the real cache directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
 @pytest.fixture(autouse=True)
 def isatty_mocks(mocker):
     """Mock isatty to return True for stdout and stderr."""
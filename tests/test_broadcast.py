@@ -0,0 +1,114 @@
+import asyncio
+from contextlib import redirect_stderr, redirect_stdout
+from io import StringIO
+from pathlib import Path
+import socket
+import sys
+from tempfile import NamedTemporaryFile
+from threading import Event
+from unittest.mock import AsyncMock
+
+import pytest
+
+import dramatic
+
+from .test_main import patch_args
+
+
+def wait_for_clients(broadcaster, count):
+    for _ in range(500):
+        if len(broadcaster.clients) >= count:
+            return
+        Event().wait(0.01)
+    pytest.fail(f"Expected {count} clients to connect")
+
+
+def read_all(connection):
+    connection.settimeout(10)
+    data = b""
+    while chunk := connection.recv(4096):
+        data += chunk
+    connection.close()
+    return data
+
+
+def test_broadcast_to_tcp_clients():
+    with redirect_stdout(StringIO()) as stdout:
+        with dramatic.broadcast(("127.0.0.1", 0), speed=5000) as broadcaster:
+            first = socket.create_connection(broadcaster.address)
+            second = socket.create_connection(broadcaster.address)
+            wait_for_clients(broadcaster, 2)
+            print("Hello viewers")
+            sys.stdout.write("Still here\n")
+    assert stdout.getvalue() == "Hello viewers\nStill here\n"
+    assert read_all(first) == b"Hello viewers\nStill here\n"
+    assert read_all(second) == b"Hello viewers\nStill here\n"
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Requires Unix sockets")
+def test_broadcast_to_unix_socket_clients(tmp_path):
+    path = str(tmp_path / "dramatic.sock")
+    with redirect_stderr(StringIO()) as stderr:
+        with dramatic.broadcast(path, speed=5000) as broadcaster:
+            client = socket.socket(socket.AF_UNIX)
+            client.connect(path)
+            wait_for_clients(broadcaster, 1)
+            sys.stderr.write("Error!\n")
+    assert stderr.getvalue() == "Error!\n"
+    assert read_all(client) == b"Error!\n"
+
+
+def test_broadcast_restores_streams():
+    stdout, stderr = sys.stdout, sys.stderr
+    with dramatic.broadcast(("127.0.0.1", 0)):
+        assert sys.stdout is not stdout
+        assert sys.stderr is not stderr
+    assert sys.stdout is stdout
+    assert sys.stderr is stderr
+
+
+def test_slow_client_skips_ahead():
+    client = dramatic._BroadcastClient(writer=None, speed=75, max_backlog=10)
+    client.add("Hello ")
+    client.add("there ")
+    assert "".join(client.backlog) == "llo there "
+    client.add("world!")
+    assert "".join(client.backlog) == "ere world!"
+    assert client.backlog_size == 10
+    client.add("This is far too long")
+    assert "".join(client.backlog) == "r too long"
+    assert client.backlog_size == 10
+
+
+def test_broadcast_speed_not_capped_to_terminal_speed(mocker, cache_home):
+    (cache_home / "dramatic").mkdir(parents=True)
+    (cache_home / "dramatic" / "throughput").write_text("500\n")
+    mocker.patch("asyncio.sleep", new=AsyncMock())
+    pacer = mocker.spy(dramatic, "_Pacer")
+    writer = mocker.Mock(drain=AsyncMock())
+
+    async def run_client():
+        client = dramatic._BroadcastClient(writer, speed=1000, max_backlog=10)
+        client.add("Hi")
+        client.close()
+        await client.run()
+
+    asyncio.run(run_client())
+    assert [c.args[0] for c in writer.write.mock_calls] == [b"H", b"i"]
+    assert pacer.spy_return.interval == 1 / 1000, "Viewers aren't this terminal"
+
+
+def test_serve_command(mocks):
+    with NamedTemporaryFile(mode="wt", delete=False) as file:
+        file.write('print("Hiya!")\n')
+    path = Path(file.name)
+    try:
+        with patch_args(["serve", "--port", "0", str(path)]):
+            with redirect_stdout(StringIO()) as stdout:
+                with redirect_stderr(StringIO()) as stderr:
+                    dramatic.main()
+    finally:
+        path.unlink()
+    assert stdout.getvalue() == "Hiya!\n"
+    assert stderr.getvalue().startswith("Broadcasting on 127.0.0.1 port ")
+    assert "(connect with: nc 127.0.0.1 " in stderr.getvalue()
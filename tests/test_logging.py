@@ -0,0 +1,122 @@
+import logging
+from pathlib import Path
+from queue import Queue
+import subprocess
+import sys
+
+import pytest
+
+import dramatic
+
+from .utils import assert_write_and_sleep_calls, get_mock_args, patch_stderr
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("dramatic_tests")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger
+    dramatic.stop_logging()
+    logger.handlers.clear()
+
+
+def test_handler_writes_dramatically(mocks, logger):
+    logger.addHandler(dramatic.DramaticHandler())
+    with patch_stderr(mocks):
+        logger.warning("Uh oh")
+    assert_write_and_sleep_calls(mocks, "Uh oh\n", stderr=True)
+
+
+def test_handler_custom_speed(mocks, logger):
+    logger.addHandler(dramatic.DramaticHandler(sys.stderr, speed=30))
+    with patch_stderr(mocks):
+        logger.info("Hi")
+    assert mocks.clock.sleeps == [1 / 30] * 3
+
+
+def test_handler_does_not_double_wrap(mocks, logger):
+    with dramatic.output:
+        handler = dramatic.DramaticHandler()
+        assert handler.stream is sys.stderr
+
+
+def test_start_and_stop_logging(mocks, logger):
+    with patch_stderr(mocks):
+        handler = dramatic.start_logging(logger, speed=30)
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        logger.info("one")
+        logger.warning("two")
+        dramatic.stop_logging()
+    output = b"".join(get_mock_args(mocks.stderr_write))
+    assert output == b"INFO: one\nWARNING: two\n"
+    assert mocks.clock.sleeps == [1 / 30] * len(output)
+    assert not any(
+        isinstance(handler, dramatic._DroppingQueueHandler)
+        for handler in logger.handlers
+    )
+
+
+def test_start_logging_handler_level(mocks, logger):
+    with patch_stderr(mocks):
+        handler = dramatic.start_logging(logger)
+        handler.setLevel(logging.WARNING)
+        logger.info("Filtered")
+        logger.warning("Shown")
+        dramatic.stop_logging()
+    assert b"".join(get_mock_args(mocks.stderr_write)) == b"Shown\n"
+
+
+def test_logging_by_logger_name(mocks, logger):
+    with patch_stderr(mocks):
+        dramatic.start_logging("dramatic_tests")
+        logger.info("Named")
+        dramatic.stop_logging()
+    assert b"".join(get_mock_args(mocks.stderr_write)) == b"Named\n"
+
+
+def test_stop_logging_without_start():
+    dramatic.stop_logging()
+
+
+def test_full_queue_drops_and_coalesces_records():
+    handler = dramatic._DroppingQueueHandler(Queue(maxsize=2))
+    for n in range(5):
+        handler.handle(logging.makeLogRecord({"msg": f"record {n}"}))
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().getMessage() == "record 0"
+    assert handler.queue.get_nowait().getMessage() == "record 1"
+
+    handler.handle(logging.makeLogRecord({"msg": "record 5"}))
+    assert handler.dropped == 0
+    dropped = handler.queue.get_nowait()
+    assert dropped.getMessage() == "3 log records dropped"
+    assert dropped.levelno == logging.WARNING
+    assert handler.queue.get_nowait().getMessage() == "record 5"
+
+
+def test_queued_records_include_tracebacks():
+    handler = dramatic._DroppingQueueHandler(Queue())
+    with pytest.raises(ValueError) as error:
+        int("Oops")
+    record = logging.makeLogRecord({"msg": "%s!", "args": ("Oops",)})
+    record.exc_info = (error.type, error.value, error.tb)
+    handler.handle(record)
+    queued = handler.queue.get_nowait()
+    assert queued.getMessage().startswith("Oops!\nTraceback")
+    assert queued.getMessage().endswith(
+        "ValueError: invalid literal for int() with base 10: 'Oops'"
+    )
+    assert queued.args is None and queued.exc_info is None
+    assert record.args == ("Oops",), "Original record left as it was"
+
+
+def test_import_does_not_import_logging_handlers():
+    modules = subprocess.run(
+        [sys.executable, "-c", "import sys, dramatic; print(*sys.modules)"],
+        cwd=Path(dramatic.__file__).parent,
+        stdout=subprocess.PIPE,
+        check=True,
+        text=True,
+    ).stdout.split()
+    assert "logging.handlers" not in modules
@@ -1,6 +1,8 @@
 from contextlib import contextmanager, redirect_stdout
+from importlib.util import cache_from_source
 from io import StringIO
 from pathlib import Path
+import subprocess
 import sys
 from tempfile import NamedTemporaryFile
 from textwrap import dedent
@@ -45,21 +47,59 @@ def test_help(mocks):
     # Python 3.8 and below used "optional arguments"
     output = stdout.getvalue().replace("optional arguments", "options")
     assert output == dedent("""
-        usage: dramatic.py [--max-drama] [--min-drama] [-m mod] [--speed speed] [file]
+        usage: dramatic.py [--max-drama] [--min-drama] [--calibrate] [--drain]
+                           [-m mod] [--speed speed] [--frame-rate fps] [--tee file]
+                           [file]
 
         Run Python, but dramatically
 
         positional arguments:
-          file           program read from script file
+          file              program read from script file
 
         options:
-          --max-drama    Monkey patch Python so ALL programs run dramatically
-          --min-drama    Undo --max-drama
-          -m mod         run library module as a script
-          --speed speed  characters per second (default: 75)
+          --max-drama       Monkey patch Python so ALL programs run dramatically
+          --min-drama       Undo --max-drama
+          --calibrate       measure and save how fast this terminal displays text
+          --drain           pace by what the terminal has displayed, not just written
+          -m mod            run library module as a script
+          --speed speed     characters per second (default: 75)
+          --frame-rate fps  write characters in this many frames per second
+          --tee file        also write all output (without drama) to this file
     """).lstrip("\n")
 
 
+def test_calibrate(mocks, mocker, cache_home):
+    # Each tcdrain call takes half a second
+    tcdrain = mocker.patch(
+        "termios.tcdrain", side_effect=lambda fd: mocks.clock.increment(0.5)
+    )
+    with patch_args(["--calibrate"]):
+        with patch_stdout(mocks):
+            try:
+                dramatic.main()
+            except SystemExit as error:
+                assert error.args == (0,)
+    assert tcdrain.call_count == 2
+    throughput = cache_home / "dramatic" / "throughput"
+    assert throughput.read_text() == "8000\n"
+    output = b"".join(get_mock_args(mocks.stdout_write)).decode()
+    assert output.startswith("=" * 79)
+    assert output.endswith(
+        "\x1b[KTerminal displays about 8000 characters per second.\n"
+        + f"Wrote file {throughput}\n"
+    )
+    assert dramatic.DramaticTextIOWrapper(sys.stdout.buffer, speed=9000).speed == 8000
+
+
+def test_calibrate_requires_terminal(mocks):
+    with patch_args(["--calibrate"]):
+        with redirect_stdout(StringIO()):
+            try:
+                dramatic.main()
+            except SystemExit as error:
+                assert str(error) == "Calibration requires a terminal."
+
+
 def test_dramatic_repl(mocks):
     with patch_args([]):
         with patch_stdin("2 + 4\nexit()\n"):
@@ -106,6 +146,15 @@ def test_invalid_modules(mocks):
                 )
 
 
+def test_frame_rate_must_be_positive(mocks, capsys):
+    with patch_args(["--frame-rate", "0", "-m", "this"]):
+        try:
+            dramatic.main()
+        except SystemExit as error:
+            assert error.code == 2
+    assert "must be a positive number: '0'" in capsys.readouterr().err
+
+
 def test_file(mocks):
     with NamedTemporaryFile(mode="wt", delete=False) as file:
         file.write('print("Hiya!")\n')
@@ -119,11 +168,24 @@ def test_file(mocks):
         path.unlink()
 
 
+def test_file_with_tee(mocks, tmp_path):
+    path = tmp_path / "hiya.py"
+    path.write_text('print("Hiya!")\n')
+    log = tmp_path / "output.log"
+    with patch_args(["--tee", str(log), str(path)]):
+        with patch_stdout(mocks):
+            dramatic.main()
+            dramatic.stop()
+    assert_write_and_sleep_calls(mocks, "Hiya!\n")
+    assert log.read_text() == "Hiya!\n"
+
+
 def test_max_drama(mocks, mocker, tmp_path):
     mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
     mocker.patch("sys.prefix", return_value=str(tmp_path))
 
     dramatic_py = tmp_path / "_dramatic.py"
+    dramatic_pyc = Path(cache_from_source(str(dramatic_py)))
     dramatic_pth = tmp_path / "_dramatic.pth"
 
     with patch_args(["--max-drama"]):
@@ -141,13 +203,16 @@ def test_max_drama(mocks, mocker, tmp_path):
     assert "def start(" in dramatic_py_text
 
     dramatic_pth_text = dramatic_pth.read_text()
-    assert dramatic_pth_text == "import _dramatic; _dramatic.start()\n"
+    assert dramatic_pth_text.startswith(f"# dramatic {dramatic.__version__}\n")
+    assert "__import__('_dramatic')._max_drama_start()" in dramatic_pth_text
+    assert dramatic_pyc.exists()
 
     expected = dedent(
         f"""
         Make all global Python scripts run dramatically?
         Running with --min-drama will undo this operation.
         Are you sure? [y/N] Wrote file {dramatic_py}
+        Wrote file {dramatic_pyc}
         Wrote file {dramatic_pth}
         To undo run:
         {sys.executable} -m _dramatic --min-drama
@@ -157,6 +222,17 @@ def test_max_drama(mocks, mocker, tmp_path):
     assert_write_and_sleep_calls(mocks, expected)
 
 
+def test_import_does_not_import_py_compile():
+    code = "import sys, dramatic; print('py_compile' in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(dramatic.__file__).parent,
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    assert output == b"False\n", "Only --max-drama needs py_compile"
+
+
 def test_max_drama_no(mocks, mocker, tmp_path):
     mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
     mocker.patch("sys.prefix", return_value=str(tmp_path))
@@ -217,6 +293,7 @@ def test_max_drama_virtual_environment(mocks, mocker, tmp_path):
     mocker.patch("dramatic.getsitepackages", return_value=[str(tmp_path)])
 
     dramatic_py = tmp_path / "_dramatic.py"
+    dramatic_pyc = Path(cache_from_source(str(dramatic_py)))
     dramatic_pth = tmp_path / "_dramatic.pth"
 
     with patch_args(["--max-drama"]):
@@ -234,7 +311,9 @@ def test_max_drama_virtual_environment(mocks, mocker, tmp_path):
     assert "def start(" in dramatic_py_text
 
     dramatic_pth_text = dramatic_pth.read_text()
-    assert dramatic_pth_text == "import _dramatic; _dramatic.start()\n"
+    assert dramatic_pth_text.startswith(f"# dramatic {dramatic.__version__}\n")
+    assert "__import__('_dramatic')._max_drama_start()" in dramatic_pth_text
+    assert dramatic_pyc.exists()
 
     expected = dedent(
         f"""
@@ -242,6 +321,7 @@ def test_max_drama_virtual_environment(mocks, mocker, tmp_path):
         Make all Python scripts in this venv run dramatically?
         Running with --min-drama will undo this operation.
         Are you sure? [y/N] Wrote file {dramatic_py}
+        Wrote file {dramatic_pyc}
         Wrote file {dramatic_pth}
         To undo run:
         {sys.executable} -m _dramatic --min-drama
@@ -251,6 +331,97 @@ def test_max_drama_virtual_environment(mocks, mocker, tmp_path):
     assert_write_and_sleep_calls(mocks, expected)
 
 
+def test_max_drama_replaces_older_version(mocks, mocker, tmp_path):
+    mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
+    mocker.patch("sys.prefix", return_value=str(tmp_path))
+
+    dramatic_py = tmp_path / "_dramatic.py"
+    dramatic_pth = tmp_path / "_dramatic.pth"
+    dramatic_py.write_text("def start(): pass\n")
+    dramatic_pth.write_text("# dramatic 0.1.0\nimport _dramatic; _dramatic.start()\n")
+
+    with patch_args(["--max-drama"]):
+        with patch_stdin("y\n"):
+            with patch_stdout(mocks), patch_stderr(mocks):
+                try:
+                    dramatic.main()
+                except SystemExit as error:
+                    assert error.args == (0,)
+
+    assert dramatic_py.read_text() == Path(dramatic.__file__).read_text()
+    assert dramatic_pth.read_text().startswith(f"# dramatic {dramatic.__version__}\n")
+    output = b"".join(get_mock_args(mocks.stdout_write)).decode()
+    assert output.startswith(
+        dedent(f"""
+        Make all global Python scripts run dramatically?
+        Replacing dramatic 0.1.0 with dramatic {dramatic.__version__}.
+    """).lstrip("\n")
+    )
+
+
+def install_max_drama(mocker, tmp_path, installed_version):
+    """Install a --max-drama copy and a newer installed dramatic module."""
+    site_packages = tmp_path / "site-packages"
+    site_packages.mkdir()
+    dramatic._install_max_drama(site_packages, "def start(): pass\n", installed_version)
+    installed = tmp_path / "installed" / "dramatic.py"
+    installed.parent.mkdir()
+    installed.write_text('"""Newer dramatic."""\n\n__version__ = "9.0.0"\n')
+    spec = mocker.Mock(origin=str(installed))
+    mocker.patch("dramatic.find_spec", return_value=spec)
+    return site_packages, installed
+
+
+def test_max_drama_refreshes_stale_copy(mocker, tmp_path):
+    site_packages, installed = install_max_drama(mocker, tmp_path, "0.1.0")
+    dramatic._refresh_max_drama(site_packages)
+    assert (site_packages / "_dramatic.py").read_text() == installed.read_text()
+    dramatic_pth_text = (site_packages / "_dramatic.pth").read_text()
+    assert dramatic_pth_text.startswith("# dramatic 9.0.0\n")
+    assert Path(cache_from_source(str(site_packages / "_dramatic.py"))).exists()
+
+
+def test_max_drama_keeps_current_copy(mocker, tmp_path):
+    site_packages, _ = install_max_drama(mocker, tmp_path, "9.0.0")
+    dramatic._refresh_max_drama(site_packages)
+    assert (site_packages / "_dramatic.py").read_text() == "def start(): pass\n"
+
+    mocker.patch("dramatic.find_spec", return_value=None)  # Not installed
+    (site_packages / "_dramatic.pth").write_text("# dramatic 0.1.0\n")
+    dramatic._refresh_max_drama(site_packages)
+    assert (site_packages / "_dramatic.py").read_text() == "def start(): pass\n"
+
+
+def run_max_drama_hook(
+    mocker, *, isatty=True, argv=("adventure.py",), orig_argv=(), env=()
+):
+    """Run the _dramatic.pth hook line, returning whether it started drama."""
+    fake_dramatic = mocker.Mock()
+    mocker.patch.dict("sys.modules", {"_dramatic": fake_dramatic})
+    mocker.patch("os.isatty", return_value=isatty)
+    mocker.patch("sys.argv", list(argv))
+    mocker.patch("sys.orig_argv", ["python3", *orig_argv, *argv[1:]], create=True)
+    mocker.patch.dict("os.environ", dict(env), clear=True)
+    exec(dramatic._MAX_DRAMA_HOOK, {})
+    return fake_dramatic._max_drama_start.called
+
+
+def test_max_drama_hook(mocker):
+    assert run_max_drama_hook(mocker)
+    assert not run_max_drama_hook(mocker, isatty=False)
+    assert not run_max_drama_hook(mocker, env={"DRAMATIC_DISABLE": "1"})
+    programs = {"DRAMATIC_PROGRAMS": "adventure.py,pytest"}
+    assert run_max_drama_hook(mocker, argv=["/games/adventure.py"], env=programs)
+    assert run_max_drama_hook(mocker, argv=["/usr/bin/pytest"], env=programs)
+    assert not run_max_drama_hook(mocker, argv=["/usr/bin/pip"], env=programs)
+    # While .pth files run, sys.argv is just ["-m", ...] for "python3 -m pytest"
+    pytest_module = {"argv": ["-m", "-q"], "orig_argv": ["-m", "pytest"]}
+    assert run_max_drama_hook(mocker, **pytest_module, env=programs)
+    pip_module = {"argv": ["-m", "install"], "orig_argv": ["-m", "pip"]}
+    assert not run_max_drama_hook(mocker, **pip_module, env=programs)
+    assert not run_max_drama_hook(mocker, argv=["-m"], env=programs)
+
+
 def test_min_drama(mocks, mocker, tmp_path):
     mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
     mocker.patch("sys.prefix", return_value=str(tmp_path))
@@ -282,6 +453,38 @@ def test_min_drama(mocks, mocker, tmp_path):
     assert_write_and_sleep_calls(mocks, expected)
 
 
+def test_min_drama_removes_bytecode(mocks, mocker, tmp_path):
+    mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
+    mocker.patch("sys.prefix", return_value=str(tmp_path))
+
+    dramatic_py = tmp_path / "_dramatic.py"
+    dramatic_pyc = Path(cache_from_source(str(dramatic_py)))
+    dramatic_pth = tmp_path / "_dramatic.pth"
+    dramatic_py.write_text("def start(): pass\n")
+    dramatic_pyc.parent.mkdir()
+    dramatic_pyc.write_bytes(b"")
+    dramatic_pth.write_text("import _dramatic; _dramatic.start()\n")
+
+    with patch_args(["--min-drama"]):
+        with patch_stdout(mocks), patch_stderr(mocks):
+            try:
+                dramatic.main()
+            except SystemExit as error:
+                assert error.args == (0,)
+
+    assert not dramatic_pyc.exists()
+    expected = dedent(
+        f"""
+        Removing dramatic.pth from global environment.
+        Deleted file {dramatic_pth}
+        Deleted file {dramatic_py}
+        Deleted file {dramatic_pyc}
+        No drama.
+        """
+    ).lstrip("\n")
+    assert b"".join(get_mock_args(mocks.stdout_write)) == expected.encode()
+
+
 def test_min_drama_no_files(mocks, mocker, tmp_path):
     mocker.patch("dramatic.getusersitepackages", return_value=str(tmp_path))
     mocker.patch("sys.prefix", return_value=str(tmp_path))
@@ -0,0 +1,151 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+import dramatic
+
+
+def wsgi_app(body, content_type="text/plain; charset=utf-8", headers=()):
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", content_type), *headers])
+        yield from body
+
+    return app
+
+
+def call_wsgi(app):
+    responses = []
+
+    def start_response(status, headers, exc_info=None):
+        responses.append((status, headers))
+
+    chunks = list(app({"REQUEST_METHOD": "GET", "PATH_INFO": "/"}, start_response))
+    return responses, chunks
+
+
+def asgi_app(body, content_type=b"text/plain; charset=utf-8"):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type)]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for index, chunk in enumerate(body, start=1):
+            more_body = index < len(body)
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+    return app
+
+
+def call_asgi(app, mocks, mocker):
+    mocker.patch("asyncio.sleep", new=AsyncMock(side_effect=mocks.clock.increment))
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({"type": "http", "method": "GET", "path": "/"}, receive, send))
+    return messages
+
+
+def test_wsgi_paces_text_responses(mocks):
+    app = dramatic.DramaticWSGIMiddleware(wsgi_app([b"Hel", b"lo\n"]))
+    responses, chunks = call_wsgi(app)
+    assert responses == [("200 OK", [("Content-Type", "text/plain; charset=utf-8")])]
+    assert chunks == [b"H", b"e", b"l", b"l", b"o", b"\n"]
+    assert mocks.clock.sleeps == pytest.approx([1 / 75] * 5)
+
+
+def test_wsgi_sleeps_once_per_frame(mocks):
+    app = dramatic.DramaticWSGIMiddleware(wsgi_app([b"a" * 100]), speed=600)
+    _, chunks = call_wsgi(app)
+    assert chunks == [b"a" * 10] * 10, "10 characters due per 1/60 second frame"
+    assert mocks.clock.sleeps == pytest.approx([1 / 60] * 9)
+
+
+def test_wsgi_custom_frame_rate(mocks):
+    app = dramatic.DramaticWSGIMiddleware(
+        wsgi_app([b"a" * 100]), speed=600, frame_rate=12
+    )
+    _, chunks = call_wsgi(app)
+    assert chunks == [b"a" * 50] * 2
+    assert mocks.clock.sleeps == pytest.approx([1 / 12])
+
+
+def test_wsgi_speed_not_capped_to_terminal_speed(mocks, cache_home):
+    (cache_home / "dramatic").mkdir(parents=True)
+    (cache_home / "dramatic" / "throughput").write_text("300\n")
+    app = dramatic.DramaticWSGIMiddleware(wsgi_app([b"a" * 100]), speed=600)
+    _, chunks = call_wsgi(app)
+    assert chunks == [b"a" * 10] * 10, "Responses aren't shown on this terminal"
+    assert mocks.clock.sleeps == pytest.approx([1 / 60] * 9)
+
+
+def test_wsgi_keeps_multibyte_characters_whole(mocks):
+    data = "✨é!".encode()
+    app = dramatic.DramaticWSGIMiddleware(wsgi_app([data[:2], data[2:5], data[5:]]))
+    _, chunks = call_wsgi(app)
+    assert chunks == ["✨".encode(), "é".encode(), b"!"]
+
+
+def test_wsgi_passes_other_responses_through(mocks):
+    body = [b"\x1f\x8b binary", b" data"]
+    app = dramatic.DramaticWSGIMiddleware(wsgi_app(body, "application/octet-stream"))
+    assert call_wsgi(app)[1] == body
+    gzipped = wsgi_app(body, headers=[("Content-Encoding", "gzip")])
+    assert call_wsgi(dramatic.DramaticWSGIMiddleware(gzipped))[1] == body
+    assert mocks.clock.sleeps == []
+
+
+def test_wsgi_closes_app_iterable(mocks):
+    closed = []
+
+    class Body(list):
+        def close(self):
+            closed.append(True)
+
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return Body([b"Hi"])
+
+    assert call_wsgi(dramatic.DramaticWSGIMiddleware(app))[1] == [b"H", b"i"]
+    assert closed == [True]
+
+
+def test_asgi_paces_text_responses(mocks, mocker):
+    app = dramatic.DramaticASGIMiddleware(asgi_app([b"Hel", b"lo\n"]))
+    messages = call_asgi(app, mocks, mocker)
+    assert messages[0]["type"] == "http.response.start"
+    bodies = [m["body"] for m in messages[1:]]
+    assert bodies == [b"H", b"e", b"l", b"", b"l", b"o", b"\n", b""]
+    assert [m["more_body"] for m in messages[1:]] == [True] * 7 + [False]
+    assert mocks.clock.sleeps == pytest.approx([1 / 75] * 5)
+
+
+def test_asgi_sleeps_once_per_frame(mocks, mocker):
+    app = dramatic.DramaticASGIMiddleware(asgi_app([b"a" * 100]), speed=600)
+    messages = call_asgi(app, mocks, mocker)
+    assert [m["body"] for m in messages[1:]] == [b"a" * 10] * 10 + [b""]
+    assert mocks.clock.sleeps == pytest.approx([1 / 60] * 9)
+
+
+def test_asgi_passes_other_responses_through(mocks, mocker):
+    body = [b"\x00\x01", b"\x02"]
+    app = dramatic.DramaticASGIMiddleware(asgi_app(body, b"image/png"))
+    messages = call_asgi(app, mocks, mocker)
+    assert [m["body"] for m in messages[1:]] == body
+    assert mocks.clock.sleeps == []
+
+
+def test_asgi_passes_other_scopes_through(mocks):
+    scopes = []
+
+    async def app(scope, receive, send):
+        scopes.append(scope)
+
+    scope = {"type": "lifespan"}
+    asyncio.run(dramatic.DramaticASGIMiddleware(app)(scope, None, None))
+    assert scopes == [scope]
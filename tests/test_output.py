@@ -1,6 +1,10 @@
 from contextlib import redirect_stdout
+from io import BufferedWriter, BytesIO, FileIO, StringIO, TextIOWrapper
+import os
+import shutil
 import sys
 from tempfile import NamedTemporaryFile
+from threading import Thread, Timer
 
 import pytest
 
@@ -56,9 +60,40 @@ def test_string_representation(mocks):
             print(sys.stdout)
     output = b"".join(get_mock_args(mocks.stdout_write)).decode()
     # File descriptor number can vary, so check the pattern instead
-    assert output.startswith("DramaticTextIOWrapper(<_io.FileIO name=")
-    assert " mode='rb+' closefd=True>)\n" in output
-    assert [c[0] for c in mocks.mock_calls] == ["stdout_write", "sleep"] * 67
+    assert output.startswith("DramaticTextProxy(<_io.TextIOWrapper name=")
+    assert " encoding='utf-8'>)\n" in output
+    assert [c[0] for c in mocks.mock_calls] == ["stdout_write", "sleep"] * len(output)
+
+
+class FakeTerminal(StringIO):
+    def isatty(self):
+        return True
+
+
+class FakeTerminalBuffer(BytesIO):
+    def isatty(self):
+        return True
+
+
+def test_output_to_stream_without_buffer(mocks):
+    terminal = FakeTerminal()
+    with redirect_stdout(terminal):
+        with dramatic.output:
+            print("Hi!")
+            with pytest.raises(AttributeError):
+                sys.stdout.extra_attribute = True  # Uses __slots__
+    assert terminal.getvalue() == "Hi!\n"
+    assert mocks.clock.sleeps == [1 / 75] * 4
+
+
+def test_output_uses_original_encoding(mocks):
+    buffer = FakeTerminalBuffer()
+    terminal = TextIOWrapper(buffer, encoding="ascii", errors="replace")
+    with redirect_stdout(terminal):
+        with dramatic.output:
+            print("café")
+    assert buffer.getvalue() == b"caf?\n"
+    assert len(mocks.clock.sleeps) == 5
 
 
 def test_default_speed(mocks):
@@ -217,3 +252,197 @@ def test_slow_write_does_not_raise_error(mocker):
     # Verify that sleep was called only when duration was positive
     # With 20ms writes and 13.3ms target, no sleeps should occur
     assert len(slow_clock.sleeps) == 0
+
+
+def get_raw_writes(mock_function):
+    return [c.args[0] for c in mock_function.mock_calls]
+
+
+def test_progress_bar_frames_are_dramatic_once(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("Loading 0%")
+            for percent in range(10, 101, 10):
+                sys.stdout.write(f"\rLoading {percent}%")
+            sys.stdout.write("\n")
+            sys.stdout.write("Done\n")
+    assert get_raw_writes(mocks.stdout_write) == [
+        *byte_list("Loading 0%\r"),
+        b"Loading 10%",
+        *[f"\rLoading {percent}%".encode() for percent in range(20, 101, 10)],
+        b"\n",
+        *byte_list("Done\n"),
+    ]
+    assert len(mocks.clock.sleeps) == len("Loading 0%\rDone\n")
+
+
+def test_progress_bar_frames_in_one_write_are_coalesced(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("\r10%\r20%\r30%\n")
+    assert get_raw_writes(mocks.stdout_write) == [
+        *byte_list("\r10%\r"),
+        b"30%\n",
+    ]
+    assert len(mocks.clock.sleeps) == 5
+
+
+def test_shorter_frames_do_not_hide_longer_ones(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("Go\rabc\r9\rxy\n")
+    assert get_raw_writes(mocks.stdout_write) == [
+        *byte_list("Go\r"),
+        b"abc\rxy\n",
+    ]
+
+
+def test_colors_do_not_count_toward_frame_width(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("xxxxx\r")
+            sys.stdout.write("more\r\x1b[1mmore\x1b[0m\rMORE\r")
+            sys.stdout.write("12345\r\x1b[1mab\x1b[0m\n")
+    assert get_raw_writes(mocks.stdout_write)[-2:] == [
+        b"\x1b[1mmore\x1b[0m\rMORE\r",
+        b"12345\r\x1b[1mab\x1b[0m\n",
+    ], "Frames only skipped if later frames hide them (and have no styles)"
+
+
+def test_carriage_return_newline_is_not_a_frame(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("Hi\r\nBye\r\n")
+    assert get_raw_writes(mocks.stdout_write) == byte_list("Hi\r\nBye\r\n")
+    assert len(mocks.clock.sleeps) == 9
+
+
+def get_byte_writes(mock_function):
+    return [bytes(c.args[0]) for c in mock_function.mock_calls]
+
+
+def test_writing_bytes_dramatically(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            assert isinstance(sys.stdout.buffer, dramatic.DramaticBufferedWriter)
+            assert sys.stdout.buffer.write("Héllo ✨\n".encode()) == 11
+    assert get_byte_writes(mocks.stdout_write) == [
+        char.encode() for char in "Héllo ✨\n"
+    ]
+    assert mocks.clock.sleeps == [1 / 75] * 8
+
+
+def test_writing_bytes_never_splits_characters(mocks):
+    data = "é✨".encode()
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.buffer.write(data[:1])
+            sys.stdout.buffer.write(data[1:3])
+            sys.stdout.buffer.write(bytearray(data[3:]))
+    assert get_byte_writes(mocks.stdout_write) == [b"\xc3\xa9", "✨".encode()]
+    assert len(mocks.clock.sleeps) == 2
+
+
+def test_writing_invalid_utf8_bytes(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.buffer.write(b"caf\xe9\n\xff\x80\xe2\x9c!")
+    assert get_byte_writes(mocks.stdout_write) == [
+        *byte_list("caf"),
+        b"\xe9",
+        b"\n",
+        b"\xff",
+        b"\x80",
+        b"\xe2\x9c",
+        b"!",
+    ], "Invalid bytes aren't held waiting for the rest of a character"
+
+
+def test_flush_writes_partial_characters(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.buffer.write(b"caf\xc3")
+            sys.stdout.flush()
+            assert b"".join(get_byte_writes(mocks.stdout_write)) == b"caf\xc3"
+
+
+def test_writelines_dramatically(mocks):
+    tee = StringIO()
+    with patch_stdout(mocks):
+        proxy = dramatic.DramaticTextProxy(sys.stdout, tee=tee)
+        proxy.writelines(["ab\n", "c\n"])
+        proxy.buffer.writelines([b"d\n"])
+    assert get_byte_writes(mocks.stdout_write) == byte_list("ab\nc\nd\n")
+    assert tee.getvalue() == "ab\nc\nd\n"
+    assert len(mocks.clock.sleeps) == 7
+
+
+def test_writing_bytes_keeps_order_with_text(mocks):
+    with dramatic.output:
+        with patch_stdout(mocks):
+            sys.stdout.write("a")
+            sys.stdout.buffer.write(b"b")
+            print("c")
+            shutil.copyfileobj(BytesIO(b"d\n"), sys.stdout.buffer)
+    assert b"".join(get_byte_writes(mocks.stdout_write)) == b"abc\nd\n"
+    assert len(mocks.clock.sleeps) == 6
+
+
+def test_writing_bytes_to_file(mocks):
+    """No sleeping when stdout's buffer is a real file."""
+    with NamedTemporaryFile(mode="wt") as file:
+        with redirect_stdout(file):
+            with patch_stdout(mocks):
+                with dramatic.output:
+                    sys.stdout.buffer.write(b"Dramatic?\n")
+                    sys.stdout.flush()
+        assert get_byte_writes(mocks.stdout_write) == [b"Dramatic?\n"]
+        assert len(mocks.clock.sleeps) == 0
+
+
+class PipeTerminal(TextIOWrapper):
+    def isatty(self):
+        return True
+
+
+class PipeTerminalBuffer(BufferedWriter):
+    def isatty(self):
+        return True
+
+
+def fill_pipe(fd):
+    """Write to a non-blocking pipe until it's full."""
+    try:
+        while True:
+            os.write(fd, b"." * 4096)
+    except BlockingIOError:
+        pass
+
+
+def test_non_blocking_terminal_waits_instead_of_losing_text(mocks, mocker):
+    wait_writable = mocker.spy(dramatic, "_wait_writable")
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    fill_pipe(write_fd)
+    received = bytearray()
+
+    def read_all():
+        with open(read_fd, "rb", buffering=0) as reader:
+            while chunk := reader.read(65536):
+                received.extend(chunk)
+
+    reader = Thread(target=read_all)
+    start_reading = Timer(0.05, reader.start)  # After writing has stalled
+    start_reading.start()
+    terminal = PipeTerminal(PipeTerminalBuffer(FileIO(write_fd, "w")), encoding="utf-8")
+    stream = dramatic.DramaticTextProxy(terminal)
+    stream.write("Hi ✨\n")
+    stream.buffer.write(b"Bye\n")
+    stream.buffer.flush()
+    terminal.close()
+    start_reading.join()
+    reader.join()
+
+    assert received.lstrip(b".") == "Hi ✨\nBye\n".encode()
+    assert wait_writable.called
+    assert len(mocks.clock.sleeps) == len("Hi ✨\nBye\n")
@@ -0,0 +1,188 @@
+from contextlib import suppress
+import os
+from pathlib import Path
+import pty
+import subprocess
+import sys
+from textwrap import dedent
+
+import pytest
+
+import dramatic
+
+ROOT = Path(dramatic.__file__).parent
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", dedent(code)],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        timeout=60,
+        check=True,
+    ).stdout
+
+
+@pytest.fixture
+def ring():
+    ring = dramatic._RingBuffer(size=16)
+    yield ring
+    ring.close(unlink=True)
+
+
+def test_ring_buffer_put_and_get(ring):
+    assert ring.get() == b""
+    assert ring.put(b"Hello", b" there")
+    assert ring.get() == b"Hello there"
+    assert ring.get() == b""
+
+
+def test_ring_buffer_wraps_around(ring):
+    assert ring.put(b"0123456789")
+    assert ring.get() == b"0123456789"
+    assert ring.put(b"abcdefghij")  # Wraps past the end of the ring
+    assert ring.get() == b"abcdefghij"
+
+
+def test_ring_buffer_full(ring):
+    assert ring.put(b"0123456789")
+    assert not ring.put(b"abcdefg"), "Too big to fit, so nothing is written"
+    assert ring.put(b"abcdef")
+    assert not ring.put(b"!")
+    assert ring.get() == b"0123456789abcdef"
+    assert ring.put(memoryview(b"!"))
+
+
+def test_ring_buffer_shared_by_name(ring):
+    other = dramatic._RingBuffer(ring.name)
+    try:
+        assert other.capacity == 16
+        assert not other.closed
+        ring.put(b"Hi")
+        ring.closed = True
+        assert other.closed
+        assert other.get() == b"Hi"
+        assert ring.get() == b""
+    finally:
+        other.close()
+
+
+def test_renderer_process_output():
+    output = run_python("""
+        import sys
+        import dramatic
+
+        dramatic.start(process=True, speed=100_000)
+        print("out")
+        print("err", file=sys.stderr)
+        print("é" * 10_000)
+        print("done")
+    """)
+    assert output == ("out\nerr\n" + "é" * 10_000 + "\ndone\n").encode()
+
+
+def test_renderer_process_bytes_output():
+    output = run_python("""
+        import sys
+        import dramatic
+
+        dramatic.start(process=True, speed=100_000)
+        print("text", flush=True)
+        assert sys.stdout.buffer.write(b"bytes \\xc3") == 7
+        sys.stdout.buffer.write(b"\\xa9\\n")
+        print("more text")
+        sys.stdout.writelines(["lines 1\\n", "lines 2\\n"])
+        sys.stdout.buffer.writelines([b"byte lines\\n"])
+    """)
+    assert output == "text\nbytes é\nmore text\nlines 1\nlines 2\nbyte lines\n".encode()
+
+
+def test_renderer_process_output_from_threads():
+    output = run_python("""
+        import sys
+        from threading import Thread
+        import dramatic
+
+        def count(name):
+            for n in range(3000):
+                sys.stdout.write(f"{name} {n}\\n")
+
+        dramatic.start(process=True, speed=100_000)
+        threads = [Thread(target=count, args=(name,)) for name in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    """)
+    lines = output.decode().splitlines()
+    assert sorted(lines) == sorted(
+        f"{name} {n}" for name in "abcd" for n in range(3000)
+    )
+
+
+def run_python_in_terminal(code):
+    primary, secondary = pty.openpty()
+    process = subprocess.Popen(
+        [sys.executable, "-c", dedent(code)],
+        cwd=ROOT,
+        stdout=secondary,
+        stderr=secondary,
+    )
+    os.close(secondary)
+    output = b""
+    with suppress(OSError):  # Reading fails once the terminal is closed
+        while chunk := os.read(primary, 4096):
+            output += chunk
+    os.close(primary)
+    assert process.wait(timeout=60) == 0
+    return output
+
+
+def test_renderer_process_ctrl_c_loses_nothing():
+    output = run_python_in_terminal("""
+        import signal
+        import time
+        import dramatic
+
+        dramatic.start(process=True, speed=2_000)
+        print(*(f"line {n}" for n in range(200)), sep="\\n")
+        time.sleep(0.2)  # Give the renderer time to start
+        for _ in range(5):
+            dramatic._renderer.process.send_signal(signal.SIGINT)
+            time.sleep(0.05)
+    """)
+    lines = output.decode().splitlines()
+    assert lines == [f"line {n}" for n in range(200)]
+
+
+def test_renderer_process_crash_falls_back():
+    output = run_python("""
+        import dramatic
+
+        dramatic.start(process=True, speed=100_000)
+        dramatic._renderer.process.kill()
+        dramatic._renderer.process.wait()
+        print("still printing " * 10_000)
+        print("done")
+    """)
+    assert output == ("still printing " * 10_000 + "\ndone\n").encode()
+
+
+def test_import_does_not_import_subprocess():
+    output = run_python("import sys, dramatic; print('subprocess' in sys.modules)")
+    assert output == b"False\n"
+
+
+def test_start_and_stop_renderer_process():
+    stdout, stderr = sys.stdout, sys.stderr
+    dramatic.start(process=True)
+    renderer = dramatic._renderer
+    assert isinstance(sys.stdout, dramatic._RendererStream)
+    assert isinstance(sys.stderr, dramatic._RendererStream)
+    assert sys.stdout.isatty()
+    dramatic.stop()
+    assert sys.stdout is stdout
+    assert sys.stderr is stderr
+    assert renderer.process.returncode == 0
+    assert dramatic._renderer is None
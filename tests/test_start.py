@@ -1,4 +1,9 @@
+from io import StringIO
+import os
 import sys
+import termios
+
+import pytest
 
 import dramatic
 
@@ -132,3 +137,248 @@ def test_stop_works_properly(mocks):
     assert len(mocks.stdout_write.mock_calls) < 3
     assert get_mock_args(mocks.stderr_write) == [b"Error\n"]
     assert len(mocks.clock.sleeps) == 0
+
+
+def test_start_with_drain(mocks, mocker):
+    tcdrain = mocker.patch("termios.tcdrain")
+    dramatic.start(drain=True)
+    with patch_stdout(mocks):
+        sys.stdout.write("Hi\n")
+    dramatic.stop()
+    assert_write_and_sleep_calls(mocks, "Hi\n")
+    assert tcdrain.call_count == 3
+    tcdrain.assert_called_with(sys.stdout.fileno())
+
+
+def test_drain_ignores_non_terminals(mocks, mocker):
+    mocker.patch("termios.tcdrain", side_effect=termios.error(25, "Not a tty"))
+    dramatic.start(drain=True)
+    with patch_stdout(mocks):
+        sys.stdout.write("Hi\n")
+    dramatic.stop()
+    assert_write_and_sleep_calls(mocks, "Hi\n")
+
+
+def test_ctrl_c_while_draining(mocks, mocker):
+    def tcdrain(fd):
+        if tcdrain.calls == 2:  # Hit Ctrl-C while the first "l" is being transmitted
+            raise KeyboardInterrupt
+        tcdrain.calls += 1
+
+    tcdrain.calls = 0
+    mocker.patch("termios.tcdrain", side_effect=tcdrain)
+    dramatic.start(drain=True)
+    with patch_stdout(mocks):
+        sys.stdout.write("Hello\n")
+    dramatic.stop()
+    assert get_mock_args(mocks.stdout_write) == byte_list("Hello\n")
+    assert tcdrain.calls == 2, "No draining after Ctrl-C"
+    assert len(mocks.clock.sleeps) == 2
+
+
+def test_speed_capped_to_calibrated_speed(mocks, cache_home):
+    (cache_home / "dramatic").mkdir(parents=True)
+    (cache_home / "dramatic" / "throughput").write_text("500\n")
+    dramatic.start(speed=1000)
+    with patch_stdout(mocks):
+        sys.stdout.write("Dramatic?\n")
+    dramatic.stop()
+    assert mocks.clock.sleeps == [1 / 500] * 10
+
+    dramatic.start(speed=30)
+    with patch_stdout(mocks):
+        sys.stdout.write("Hi")
+    dramatic.stop()
+    assert mocks.clock.sleeps[10:] == [1 / 30] * 2
+
+
+def get_raw_writes(mock_function):
+    return [c.args[0] for c in mock_function.mock_calls]
+
+
+def test_repeated_lines_fast(mocks):
+    dramatic.start(repeated="fast")
+    with patch_stdout(mocks):
+        print("Retry 1 failed")
+        print("Other")
+        print("Retry 2 failed")
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == [
+        *byte_list("Retry 1 failed\nOther\n"),
+        b"Retry 2 failed\n",
+    ], "Near-duplicate line (only digits differ) written all at once"
+    assert len(mocks.clock.sleeps) == len("Retry 1 failed\nOther\n")
+
+
+def test_repeated_lines_collapse(mocks):
+    dramatic.start(repeated="collapse")
+    with patch_stdout(mocks):
+        for _ in range(3):
+            print("Heartbeat")
+        print("Done")
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == [
+        *byte_list("Heartbeat\n"),
+        b"(repeated 2 times)\n",
+        b"\x1b[A\r(repeated 3 times)\n",
+        *byte_list("Done\n"),
+    ]
+
+
+def test_repeated_lines_collapse_after_other_output(mocks):
+    dramatic.start(repeated="collapse")
+    with patch_stdout(mocks), patch_stderr(mocks):
+        for _ in range(2):
+            print("Heartbeat")
+        print("ERROR: disk full", file=sys.stderr)
+        print("Heartbeat")
+        sys.stdout.buffer.write(b"bytes\n")
+        print("Heartbeat")
+        print("Heartbeat")
+    dramatic.stop()
+    assert b"".join(get_raw_writes(mocks.stdout_write)) == (
+        b"Heartbeat\n(repeated 2 times)\n(repeated 3 times)\n"
+        b"bytes\nHeartbeat\n(repeated 2 times)\n"
+    ), "Markers never moved up over other output"
+
+
+def test_collapse_markers_not_updated_on_shared_terminal(mocks):
+    primary, secondary = os.openpty()
+    with open(secondary, "w") as plain, open(os.dup(secondary), "w") as terminal:
+        writer = dramatic.DramaticTextProxy(terminal, repeated="collapse")
+        with dramatic._patch_stream("stderr", plain):
+            assert dramatic._shares_terminal_with_plain_stream(writer)
+        with dramatic._patch_stream("stderr", dramatic.DramaticTextProxy(plain)):
+            assert not dramatic._shares_terminal_with_plain_stream(writer)
+    os.close(primary)
+
+
+def test_repeated_lines_window(mocks):
+    dramatic.start(repeated="fast", repeat_window=2)
+    with patch_stdout(mocks):
+        sys.stdout.write("A\nB\nC\nA\nC\n")
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == [*byte_list("A\nB\nC\nA\n"), b"C\n"]
+
+
+def test_stop_writes_held_partial_lines(mocks):
+    dramatic.start(repeated="fast")
+    with patch_stdout(mocks):
+        sys.stdout.write("partial")
+        dramatic.stop()
+    assert get_mock_args(mocks.stdout_write) == byte_list("partial")
+
+
+def test_repeated_lines_keep_partial_lines(mocks):
+    dramatic.start(repeated="fast")
+    with patch_stdout(mocks):
+        sys.stdout.write("Name: ")
+        sys.stdout.flush()
+        assert get_raw_writes(mocks.stdout_write) == byte_list("Name: ")
+        sys.stdout.write("Trey\n")
+        print("Name: Trey")
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == byte_list("Name: Trey\n" * 2), (
+        "Flushed text isn't checked for repeats"
+    )
+
+
+def test_frame_rate(mocks):
+    dramatic.start(speed=600, frame_rate=60)
+    with patch_stdout(mocks):
+        sys.stdout.write("a" * 25)
+        sys.stdout.buffer.write(b"b" * 15)
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == [
+        b"a" * 10,
+        b"a" * 10,
+        b"a" * 5,
+        b"b" * 10,
+        b"b" * 5,
+    ], "All characters due in each 1/60 second frame written at once"
+    assert mocks.clock.sleeps == pytest.approx(
+        [1 / 60, 1 / 60, 1 / 120, 1 / 60, 1 / 120]
+    )
+
+
+@pytest.mark.parametrize("frame_rate", [0, -30])
+def test_frame_rate_must_be_positive(mocks, frame_rate):
+    with pytest.raises(ValueError, match="frame_rate must be positive"):
+        dramatic.start(frame_rate=frame_rate)
+    with pytest.raises(ValueError, match="frame_rate must be positive"):
+        dramatic.DramaticTextProxy(StringIO(), frame_rate=frame_rate)
+
+
+def test_escape_sequences_written_without_pauses(mocks):
+    dramatic.start()
+    with patch_stdout(mocks):
+        sys.stdout.write("\x1b[31mHi\x1b[0m")
+    dramatic.stop()
+    assert get_raw_writes(mocks.stdout_write) == [b"\x1b[31mH", b"i", b"\x1b[0m"]
+    assert mocks.clock.sleeps == pytest.approx([1 / 75] * 2)
+
+
+def test_repeated_strings_reuse_write_plans(mocks):
+    dramatic.start()
+    with patch_stdout(mocks):
+        for _ in range(3):
+            sys.stdout.write(">>> ")
+    dramatic.stop()
+    assert get_mock_args(mocks.stdout_write) == byte_list(">>> " * 3)
+    info = dramatic.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+    assert info.hit_rate == pytest.approx(2 / 3)
+    assert info.memory > 0
+
+
+def test_write_plan_cache_is_bounded(mocks, monkeypatch):
+    monkeypatch.setattr(dramatic._plans, "maxsize", 2)
+    dramatic.start(speed=10_000)
+    with patch_stdout(mocks):
+        for text in ["a", "b", "a", "c", "b", "x" * 5000]:
+            sys.stdout.write(text)
+    dramatic.stop()
+    info = dramatic.cache_info()
+    assert info.currsize == 2, "Least recently used plan ('b') was evicted"
+    assert (info.hits, info.misses) == (1, 4), "Very long strings aren't cached"
+    assert list(dramatic._plans.plans) == [("c", 1), ("b", 1)]
+
+
+def test_write_plan_cache_memory_is_bounded(mocks, monkeypatch):
+    dramatic.start(speed=10_000)
+    with patch_stdout(mocks):
+        sys.stdout.write("x" * 1000)
+        monkeypatch.setattr(dramatic._plans, "maxmemory", dramatic.cache_info().memory)
+        sys.stdout.write("y" * 1000)
+    dramatic.stop()
+    info = dramatic.cache_info()
+    assert info.currsize == 1, "Least recently used plan dropped to make room"
+    assert list(dramatic._plans.plans) == [("y" * 1000, 1)]
+    assert info.memory <= dramatic._plans.maxmemory
+
+
+def test_tee(mocks, tmp_path):
+    log = tmp_path / "output.log"
+    dramatic.start(tee=log)
+    with patch_stdout(mocks), patch_stderr(mocks):
+        sys.stdout.write("Hello")
+        assert log.read_text() == "Hello", "Written to the file before drama"
+        print(", world!")
+        print("Uh oh", file=sys.stderr)
+        sys.stdout.buffer.write("✨\n".encode())
+    dramatic.stop()
+    assert log.read_text() == "Hello, world!\nUh oh\n✨\n"
+    written = b"".join(bytes(c.args[0]) for c in mocks.stdout_write.mock_calls)
+    assert written == "Hello, world!\n✨\n".encode()
+    assert len(mocks.clock.sleeps) == len("Hello, world!\nUh oh\n✨\n")
+
+
+def test_tee_file_object(mocks):
+    log = StringIO()
+    dramatic.start(tee=log, stderr=False)
+    with patch_stdout(mocks):
+        print("Hi")
+        sys.stdout.buffer.write(b"Bye\n")
+    dramatic.stop()
+    assert log.getvalue() == "Hi\nBye\n"
+    assert not log.closed, "Only files opened by start are closed"
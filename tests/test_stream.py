@@ -0,0 +1,119 @@
+import asyncio
+from io import StringIO
+import sys
+from unittest.mock import AsyncMock
+
+import pytest
+
+import dramatic
+
+from .utils import byte_list, get_mock_args, patch_stdout
+
+
+def test_stream_chunks(mocks):
+    with patch_stdout(mocks):
+        dramatic.stream(iter(["Hel", "lo\n"]))
+    assert get_mock_args(mocks.stdout_write) == byte_list("Hello\n")
+    assert mocks.clock.sleeps == pytest.approx([1 / 75] * 5)
+    assert [c[0] for c in mocks.mock_calls] == (
+        ["stdout_write"] + ["sleep", "stdout_write"] * 5
+    ), "Wrote the first character right away, then slept between each"
+
+
+def test_stream_custom_speed(mocks):
+    with patch_stdout(mocks):
+        dramatic.stream(["Hi", "!"], speed=30)
+    assert mocks.clock.sleeps == pytest.approx([1 / 30] * 2)
+
+
+def test_stream_speed_capped_to_calibrated_speed(mocks, cache_home):
+    (cache_home / "dramatic").mkdir(parents=True)
+    (cache_home / "dramatic" / "throughput").write_text("500\n")
+    with patch_stdout(mocks):
+        dramatic.stream(["Hi", "!"], speed=1000)
+    assert mocks.clock.sleeps == pytest.approx([1 / 500] * 2)
+
+
+def test_stream_consumes_lazily(mocks):
+    events = []
+
+    def chunks():
+        events.append("first")
+        yield "ab"
+        events.append("second")
+        yield "cd"
+
+    with patch_stdout(mocks):
+        mocks.stdout_write.side_effect = events.append
+        dramatic.stream(chunks())
+    assert events == ["first", b"a", b"b", "second", b"c", b"d"]
+
+
+def test_stream_slow_source_adds_no_delay(mocks):
+    def chunks():
+        yield "ab"
+        mocks.clock.increment(1)  # Source takes 1 second for the next chunk
+        yield "cd"
+
+    with patch_stdout(mocks):
+        dramatic.stream(chunks())
+    assert get_mock_args(mocks.stdout_write) == byte_list("abcd")
+    assert mocks.clock.sleeps == pytest.approx([1 / 75, 1, 1 / 75])
+
+
+def test_stream_control_c(mocks):
+    mocks.clock.error_after = 2
+    with patch_stdout(mocks):
+        dramatic.stream(["Dramatic?\n"])
+    assert get_mock_args(mocks.stdout_write) == byte_list("Dramatic?\n")
+    assert len(mocks.clock.sleeps) == 2, "No sleeps after Ctrl-C"
+
+
+def test_stream_while_output_is_dramatic(mocks):
+    with patch_stdout(mocks):
+        with dramatic.output:
+            dramatic.stream(["Hi\n"])
+    assert get_mock_args(mocks.stdout_write) == byte_list("Hi\n")
+    assert len(mocks.clock.sleeps) == 2, "Not paced twice"
+
+
+def test_stream_to_dramatic_file_with_held_text_and_tee(mocks):
+    tee = StringIO()
+    with patch_stdout(mocks):
+        file = dramatic.DramaticTextProxy(sys.stdout, repeated="fast", tee=tee)
+        file.write("prompt: ")
+        dramatic.stream(["streamed\n"], file=file)
+    assert b"".join(get_mock_args(mocks.stdout_write)) == b"prompt: streamed\n"
+    assert tee.getvalue() == "prompt: streamed\n"
+
+
+def test_stream_non_terminal_file(mocks):
+    file = StringIO()
+    dramatic.stream(["Hello", ", file!\n"], file=file)
+    assert file.getvalue() == "Hello, file!\n"
+    assert len(mocks.clock.sleeps) == 0
+
+
+def test_stream_async_iterable(mocks, mocker):
+    mocker.patch("asyncio.sleep", new=AsyncMock(side_effect=mocks.clock.increment))
+
+    async def chunks():
+        yield "Hel"
+        yield "lo\n"
+
+    with patch_stdout(mocks):
+        result = asyncio.run(dramatic.stream(chunks()))
+    assert result is None
+    assert get_mock_args(mocks.stdout_write) == byte_list("Hello\n")
+    assert mocks.clock.sleeps == pytest.approx([1 / 75] * 5)
+
+
+def test_stream_async_non_terminal_file(mocks):
+    async def chunks():
+        yield "Hello"
+        yield ", file!\n"
+
+    file = StringIO()
+    asyncio.run(dramatic.stream(chunks(), file=file))
+    assert file.getvalue() == "Hello, file!\n"
+    assert len(mocks.clock.sleeps) == 0
@@ -0,0 +1,122 @@
+import asyncio
+from io import BytesIO
+import os
+import socket
+from unittest.mock import AsyncMock
+
+import pytest
+
+import dramatic
+
+
+def test_throttle_writes(mocks):
+    file = BytesIO()
+    throttled = dramatic.throttle(file, bytes_per_second=600)
+    assert throttled.write(b"x" * 100) == 100
+    assert file.getvalue() == b"x" * 100
+    assert mocks.clock.sleeps == pytest.approx([1 / 60] * 10), "Sent in pieces"
+
+
+def test_throttle_non_blocking_writes(mocks):
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+    with open(read_fd, "rb") as reader, open(write_fd, "wb", buffering=0) as raw:
+        throttled = dramatic.throttle(raw, bytes_per_second=600_000)
+        written = throttled.write(b"x" * 100_000)
+        assert 0 < written < 100_000, "Pipe filled up part way"
+        assert throttled.write(b"y" * 10) == 0, "Nothing written while it would block"
+        assert reader.read(written) == b"x" * written
+
+
+def test_throttle_reads(mocks):
+    throttled = dramatic.throttle(BytesIO(b"abc\ndef\n"), bytes_per_second=4)
+    assert list(throttled) == [b"abc\n", b"def\n"]
+    assert throttled.read() == b""
+    assert mocks.clock.sleeps == pytest.approx([1, 1])
+
+
+def test_throttle_readinto(mocks):
+    throttled = dramatic.throttle(BytesIO(b"abcd"), bytes_per_second=2)
+    buffer = bytearray(4)
+    assert throttled.readinto(buffer) == 4
+    assert buffer == b"abcd"
+    assert mocks.clock.sleeps == pytest.approx([2])
+
+
+def test_throttle_latency(mocks):
+    throttled = dramatic.throttle(BytesIO(b"abcdef"), latency=0.5)
+    assert throttled.read(3) == b"abc"
+    assert throttled.read(3) == b"def"
+    assert mocks.clock.sleeps == [0.5], "Only waited for the first bytes"
+    mocks.clock.increment(2)  # Idle
+    throttled.write(b"!")
+    assert mocks.clock.sleeps[2:] == [0.5], "Writing waits separately"
+
+
+def test_throttle_latency_after_short_gap(mocks):
+    throttled = dramatic.throttle(BytesIO(b"abcdef"), latency=0.1)
+    assert throttled.read(3) == b"abc"
+    mocks.clock.increment(0.05)  # Idle for a bit less than the latency
+    assert throttled.read(3) == b"def"
+    assert mocks.clock.sleeps == pytest.approx([0.1, 0.05, 0.1]), (
+        "Bytes sent after the link drained cross it from scratch"
+    )
+
+
+def test_throttle_accurate_over_long_transfers(mocks):
+    throttled = dramatic.throttle(BytesIO(), bytes_per_second=1000)
+    for _ in range(100):
+        mocks.clock.increment(0.001)  # Time spent elsewhere
+        throttled.write(b"x" * 7)
+    assert sum(mocks.clock.sleeps) == pytest.approx(0.701), "Time spent elsewhere"
+
+
+def test_throttle_context_manager(mocks, tmp_path):
+    path = tmp_path / "data.bin"
+    with dramatic.throttle(path.open("wb"), bytes_per_second=10) as file:
+        file.write(b"Hello")
+    assert file.closed
+    assert path.read_bytes() == b"Hello"
+
+
+def test_throttle_socket(mocks):
+    left, right = socket.socketpair()
+    with left, right:
+        throttled = dramatic.throttle(left, bytes_per_second=120)
+        throttled.sendall(b"x" * 5)
+        assert throttled.send(b"y" * 5) == 2, "Sends up to one piece at a time"
+        assert right.recv(100) == b"xxxxxyy"
+        right.sendall(b"Hi")
+        assert throttled.recv(100) == b"Hi"
+    assert mocks.clock.sleeps == pytest.approx(
+        [1 / 60, 1 / 60, 1 / 120, 1 / 60, 1 / 60]
+    )
+
+
+def test_throttle_asyncio_streams(mocks, mocker):
+    mocker.patch("asyncio.sleep", new=AsyncMock(side_effect=mocks.clock.increment))
+
+    async def main():
+        received = []
+
+        async def handle(reader, writer):
+            reader = dramatic.throttle(reader, bytes_per_second=100)
+            async for line in reader:
+                received.append(line)
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer = dramatic.throttle(writer, bytes_per_second=600)
+        writer.write(b"x" * 24 + b"\n")
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
+        await reader.read()
+        server.close()
+        await server.wait_closed()
+        return received
+
+    assert asyncio.run(main()) == [b"x" * 24 + b"\n"]
+    assert mocks.clock.sleeps == pytest.approx([1 / 60, 1 / 60, 1 / 120, 1 / 4])
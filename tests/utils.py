@@ -2,11 +2,20 @@ from contextlib import contextmanager
 import sys
 from unittest.mock import patch
 
+import dramatic
+
+
+def real_buffer(stream):
+    """Return the binary buffer underneath any dramatic binary writer."""
+    if isinstance(stream.buffer, dramatic.DramaticBufferedWriter):
+        return stream.buffer.stream
+    return stream.buffer
+
 
 @contextmanager
 def patch_stdout(mocks):
     """Monkey patch sys.stdout.buffer.write and attach to mocks object."""
-    with patch.object(sys.stdout.buffer, "write") as write:
+    with patch.object(real_buffer(sys.stdout), "write") as write:
         mocks.attach_mock(write, "stdout_write")
         try:
             yield mocks.stdout_write
@@ -20,7 +29,7 @@ def patch_stdout(mocks):
 @contextmanager
 def patch_stderr(mocks):
     """Monkey patch sys.stderr.buffer.write and attach to mocks object."""
-    with patch.object(sys.stderr.buffer, "write") as write:
+    with patch.object(real_buffer(sys.stderr), "write") as write:
         mocks.attach_mock(write, "stderr_write")
         try:
             yield mocks.stderr_write